@@ -58,12 +58,14 @@ class Assets:
         Create a customtkinter image object from an image file path and a size
 
         Args:
-            image_path (str or pathlib.Path): the path to the image file
+            image_path (str or pathlib.Path or PIL.Image.Image): the path to the image file, or an image that was already loaded
             size (tuple): the size in (x, y) to resize the image to
 
         Returns:
             customtkinter.CTkImage: a customtkinter image object with the image loaded and resized
         """
+        if isinstance(image_path, Image.Image):
+            return customtkinter.CTkImage(image_path, size=size)
         self.logger.debug(f"Creating CTkImage from {image_path}")
         return customtkinter.CTkImage(Image.open(image_path), size=size)
 
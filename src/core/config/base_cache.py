@@ -0,0 +1,205 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from core.config import constants
+from core.config.paths import Paths
+from core.logging.logger import Logger
+
+
+class BaseCache(ABC):
+    """
+    The BaseCache class holds the logic shared by the cache backends: size limits, eviction
+    and sweeping. Backends only implement the storage primitives listed below.
+
+    Entries can be pinned while their file is in use, for example while a database in the
+    cache is open. Pinned entries are not evicted and do not expire until they are unpinned.
+
+    Storage primitives:
+        - get_size: Get the total size of all entries.
+        - _evict: Remove an entry and its file.
+        - _get_eviction_candidates: Get the entries that may be evicted, in eviction order.
+        - _get_stale_entries: Get the entries that are expired, invalid or missing their file.
+        - _get_referenced_paths: Get the paths of all files referenced by entries.
+        - _is_metadata_file: Check whether a file in the cache directory belongs to the backend itself.
+    """
+    # files that are not in the index are only removed once they are older than this,
+    # so that files which are being added are not mistaken for orphans
+    ORPHAN_GRACE_PERIOD = 60 * 10
+    EVICTION_POLICIES = ("lru", "lfu")
+
+    def __init__(self, paths: Paths, max_size: int = constants.App.CACHE_MAX_SIZE.value, eviction_policy: str = "lru", cache_directory: Path = None):
+        self.logger = Logger(self.__class__.__module__ + "." + self.__class__.__name__).get_logger()
+        self.paths = paths
+        self.cache_directory = cache_directory if cache_directory is not None else self.paths.cache_dir
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        if eviction_policy not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        self.max_size = max_size
+        self.eviction_policy = eviction_policy
+        self._lock = threading.RLock()
+        self._sweeper_stop = threading.Event()
+        self._sweeper_thread = None
+        self._pinned_keys = {}
+
+    @abstractmethod
+    def get_size(self):
+        """
+        Returns:
+            int: The total size of all entries in bytes.
+        """
+
+    @abstractmethod
+    def _evict(self, key: str):
+        """
+        Returns:
+            int: The number of bytes reclaimed.
+        """
+
+    @abstractmethod
+    def _get_eviction_candidates(self, protected_key=None):
+        """
+        Returns:
+            list: (key, size) tuples ordered from the first to the last entry to evict.
+        """
+
+    @abstractmethod
+    def _get_stale_entries(self, now: float):
+        """
+        Returns:
+            list: (key, expired) tuples, where expired is False for invalid entries or entries whose file is missing.
+        """
+
+    @abstractmethod
+    def _get_referenced_paths(self):
+        """
+        Returns:
+            set: The resolved paths of the files referenced by entries.
+        """
+
+    @abstractmethod
+    def _is_metadata_file(self, file):
+        """
+        Returns:
+            bool: True if the file belongs to the backend itself, such as its index, and must not be swept.
+        """
+
+    def pin(self, key: str):
+        """
+        Keep an entry from being evicted or expiring until it is unpinned.
+        Each call to pin must be matched by a call to unpin.
+
+        Args:
+            key (str): The key to pin.
+        """
+        with self._lock:
+            self._pinned_keys[key] = self._pinned_keys.get(key, 0) + 1
+
+    def unpin(self, key: str):
+        """
+        Release a pin taken with pin.
+
+        Args:
+            key (str): The key to unpin.
+        """
+        with self._lock:
+            count = self._pinned_keys.get(key, 0) - 1
+            if count > 0:
+                self._pinned_keys[key] = count
+            else:
+                self._pinned_keys.pop(key, None)
+
+    def is_pinned(self, key: str):
+        with self._lock:
+            return key in self._pinned_keys
+
+    def _enforce_size_limit(self, protected_key=None):
+        """
+        Evict entries until the cache is within max_size.
+
+        Args:
+            protected_key (str, optional): A key that should not be evicted, such as the one just added.
+
+        Returns:
+            int: The number of bytes reclaimed.
+        """
+        reclaimed = 0
+        with self._lock:
+            total_size = self.get_size()
+            if total_size <= self.max_size:
+                return 0
+            for key, size in self._get_eviction_candidates(protected_key):
+                if total_size <= self.max_size:
+                    break
+                if self.is_pinned(key):
+                    continue
+                self.logger.debug("Evicting %s from cache", key)
+                reclaimed += self._evict(key)
+                total_size -= size
+        if reclaimed:
+            self.logger.info("Evicted %s bytes from cache to stay within %s bytes", reclaimed, self.max_size)
+        return reclaimed
+
+    def sweep(self):
+        """
+        Remove expired entries, entries whose files are missing, and files in the cache
+        directory that are not referenced by any entry.
+
+        Returns:
+            int: The number of bytes reclaimed.
+        """
+        reclaimed = 0
+        now = time.time()
+        with self._lock:
+            for key, expired in self._get_stale_entries(now):
+                if expired and self.is_pinned(key):
+                    continue
+                freed = self._evict(key)
+                if expired:
+                    reclaimed += freed
+            referenced = self._get_referenced_paths()
+
+        for file in self.cache_directory.iterdir():
+            if not file.is_file() or self._is_metadata_file(file) or file.resolve() in referenced:
+                continue
+            try:
+                stat = file.stat()
+                if stat.st_mtime + self.ORPHAN_GRACE_PERIOD > now:
+                    continue
+                file.unlink()
+            except OSError:
+                continue
+            self.logger.debug("Removed orphaned cache file %s", file)
+            reclaimed += stat.st_size
+
+        reclaimed += self._enforce_size_limit()
+        self.logger.info("Cache sweep reclaimed %s bytes", reclaimed)
+        return reclaimed
+
+    def start_sweeper(self, interval: float = constants.App.CACHE_SWEEP_INTERVAL.value):
+        """
+        Start a background thread that calls sweep every interval seconds.
+
+        Args:
+            interval (float): The time between sweeps in seconds.
+        """
+        if self._sweeper_thread is not None and self._sweeper_thread.is_alive():
+            return
+
+        def run():
+            while not self._sweeper_stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as error:
+                    self.logger.error("Cache sweep failed: %s", error)
+
+        self._sweeper_stop.clear()
+        self._sweeper_thread = threading.Thread(target=run, name="CacheSweeper", daemon=True)
+        self._sweeper_thread.start()
+
+    def stop_sweeper(self):
+        """
+        Stop the background sweeper thread.
+        """
+        self._sweeper_stop.set()
@@ -1,111 +1,195 @@
+import atexit
 import json
+import os
+import re
 import shutil
+import threading
 import time
 from pathlib import Path
 
 from core.config import constants
+from core.config.base_cache import BaseCache
 from core.config.paths import Paths
-from core.logging.logger import Logger
 
 
-class Cache:
+class Cache(BaseCache):
     """
     The Cache class is used to store and retrieve data in the cache directory.
 
+    The index is loaded into memory once and all lookups are served from there. Changes to
+    the index are written back to disk in batches, a short while after the first change,
+    by writing to a temporary file and renaming it over the index file.
+
+    The total size of the cache is kept under max_size by evicting the least recently used
+    (or least frequently used) entries whenever something is added. A background sweeper can
+    be started to periodically remove expired entries and files that are not in the index.
+
     Methods:
-        - is_index_file_valid: Check if the index file is valid.
-        - create_index_file: Create the index file.
-        - get_data_from_cache: Get data from the cache.
-        - add_to_index: Add data to the index file.
-        - remove_from_index: Remove data from the index file.
-        - add_json_data_to_cache: Add JSON data to the cache.
-        - get_json_data_from_cache: Get JSON data from the cache.
-        - add_custom_file_to_cache: Add a custom file to the cache.
+        - add_file: Move a file into the cache.
+        - get_file: Get the path of a cached file.
+        - add_json: Store JSON data in the cache.
+        - get_json: Get JSON data from the cache.
+        - flush: Write pending index changes to disk.
+        - sweep: Remove expired entries and orphaned files.
+        - start_sweeper: Run sweep periodically in a background thread.
     """
-    def __init__(self, paths: Paths):
-        self.logger = Logger(__name__ + "." + self.__class__.__name__).get_logger()
-        self.paths = paths
-        self.cache_directory = self.paths.cache_dir
-        self.cache_directory.mkdir(parents=True, exist_ok=True)
+    INDEX_WRITE_DELAY = 2
+
+    def __init__(self, paths: Paths, max_size: int = constants.App.CACHE_MAX_SIZE.value, eviction_policy: str = "lru", cache_directory: Path = None):
+        super().__init__(paths, max_size, eviction_policy, cache_directory)
         self.index_file = self.cache_directory / "index.json"
+        self._index_dirty = False
+        self._write_timer = None
 
-        if not self._is_index_file_valid():
+        self._index = self._load_index_file()
+        if self._index is None:
             self._create_index_file()
+        else:
+            self._migrate_index()
+        atexit.register(self.flush)
 
-    def _is_index_file_valid(self):
+    def _load_index_file(self):
         """
-        Check if the index file is valid.
+        Load the index file from disk.
 
         Returns:
-            bool: True if the index file is valid, False otherwise.
+            dict: The contents of the index file, or None if the index file is missing or invalid.
         """
         if not self.index_file.exists():
-            return False
+            return None
         with open(self.index_file, "r", encoding="utf-8") as file:
             try:
                 contents = json.load(file)
             except json.JSONDecodeError as error:
                 self.logger.error("Index file is not a valid JSON file, full error: %s", error)
-                return False
-            if contents.get("cache_version") != constants.App.CACHE_VERSION.value:
-                self.logger.debug("Cache version mismatch, returning False")
-                return False
-        return True
+                return None
+        if not isinstance(contents, dict) or contents.get("cache_version") != constants.App.CACHE_VERSION.value:
+            self.logger.debug("Cache version mismatch, discarding index")
+            return None
+        return contents
+
+    def _migrate_index(self):
+        """
+        Bring entries written by older versions of the app up to date. Entries under keys that are
+        no longer used are removed with their files, and entries without the size or last access
+        time used for eviction are given them.
+        """
+        with self._lock:
+            for key, entry in self._entries():
+                if any(re.fullmatch(pattern, key) for pattern in constants.App.CACHE_RETIRED_KEYS.value):
+                    self.logger.info("Removing retired cache entry %s", key)
+                    self._evict(key)
+                    continue
+                if "size" in entry and "last_access" in entry:
+                    continue
+                try:
+                    stat = Path(entry["path"]).stat()
+                except (KeyError, TypeError, OSError):
+                    # invalid entry or the file no longer exists
+                    self._remove_from_index(key)
+                    continue
+                entry.setdefault("size", stat.st_size)
+                entry.setdefault("last_access", stat.st_mtime)
+                entry.setdefault("hits", 0)
+                self._mark_index_dirty()
 
     def _create_index_file(self):
         """
         Creates the index file in the cache directory.
         """
         self.logger.info("Creating cache index file")
-        self.index_file.parent.mkdir(exist_ok=True)
-        with open(self.index_file, "w", encoding="utf-8") as file:
-            json.dump({"cache_version": constants.App.CACHE_VERSION.value}, file)
+        with self._lock:
+            self._index = {"cache_version": constants.App.CACHE_VERSION.value}
+            self._write_index()
 
-    def _get_index(self):
+    def _write_atomic(self, path: Path, data):
         """
-        Get the index file.
+        Write the given data as JSON to a temporary file and rename it over the given path,
+        so that readers never see a partially written file.
 
-        Returns:
-            dict: The contents of the index file.
+        Args:
+            path (pathlib.Path): The path to write to.
+            data: The data to serialise.
         """
-        with open(self.index_file, "r", encoding="utf-8") as file:
-            return json.load(file)
+        temp_file = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_file, path)
 
-    def _set_index(self, data: dict):
+    def _write_index(self):
+        """
+        Write the in-memory index to disk.
+        """
+        with self._lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(self.index_file, self._index)
+            self._index_dirty = False
+
+    def _mark_index_dirty(self):
         """
-        Set the index file.
+        Schedule the index to be written to disk, unless a write is already pending.
+        """
+        with self._lock:
+            self._index_dirty = True
+            if self._write_timer is None:
+                self._write_timer = threading.Timer(self.INDEX_WRITE_DELAY, self.flush)
+                self._write_timer.daemon = True
+                self._write_timer.start()
+
+    def flush(self):
+        """
+        Write any pending index changes to disk.
+        """
+        with self._lock:
+            if not self._index_dirty:
+                return
+            try:
+                self._write_index()
+            except OSError as error:
+                self.logger.error("Failed to write cache index: %s", error)
 
-        Args:
-            data (dict): The data to write to the index file.
+    def _get_index(self):
         """
-        with open(self.index_file, "w", encoding="utf-8") as file:
-            json.dump(data, file)
+        Get the index.
+
+        Returns:
+            dict: The in-memory index.
+        """
+        return self._index
 
-    def _add_path_to_index(self, key: str, path: str, ttl: float):
+    def _add_path_to_index(self, key: str, path: str, ttl: float, metadata: dict = None):
         """
-        Add a given path to the index file.
+        Add a given path to the index.
 
         Args:
             key (str): The key to store the data under.
             path (str): The path to store with the key.
             ttl (float): The time-to-live for the cache entry.
+            metadata (dict, optional): Data about the file to store with the entry.
         """
-        if not self._is_index_file_valid():
-            self._create_index_file()
-            return {
-                "status": False,
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            size = 0
+        with self._lock:
+            self._index[key] = {
+                "path": str(path),  # Ensure path is stored as a string
+                "ttl": ttl,
+                "size": size,
+                "last_access": time.time(),
+                "hits": 0,
             }
-
-        index = self._get_index()
-        index[key] = {
-            "path": str(path),  # Ensure path is stored as a string
-            "ttl": ttl,
-        }
-        self._set_index(index)
+            if metadata:
+                self._index[key]["metadata"] = metadata
+            self._mark_index_dirty()
+            self._enforce_size_limit(protected_key=key)
 
     def _get_path_from_index(self, key: str):
         """
-        Get a given path from the index file.
+        Get a given path from the index.
 
         Args:
             key (str): The key to get the path for.
@@ -113,64 +197,146 @@ class Cache:
         Returns:
             dict: A dictionary with the status and path.
         """
-        if not self._is_index_file_valid():
-            self._create_index_file()
-            return {
-                "status": False,
-            }
+        with self._lock:
+            if key not in self._index:
+                self.logger.debug("Key %s not found in cache", key)
+                return {
+                    "status": False,
+                }
 
-        index = self._get_index()
-        if key not in index:
-            self.logger.debug("Key %s not found in cache", key)
-            return {
-                "status": False,
-            }
+            data = self._index.get(key)
+            try:
+                path = Path(data["path"])
+                ttl = data["ttl"]
+            except (KeyError, TypeError) as error:
+                # index entry is invalid, remove it
+                self.logger.error("Data for key %s is invalid: %s", key, error)
+                self._remove_from_index(key)
+                return {
+                    "status": False,
+                }
 
-        data = index.get(key)
-        try:
-            path = Path(data["path"])
-            ttl = data["ttl"]
-        except (KeyError, TypeError) as error:
-            # index entry is invalid, remove it
-            self.logger.error("Data for key %s is invalid: %s", key, error)
-            self._remove_from_index(key)
-            return {
-                "status": False,
-            }
+            if not path.exists():
+                self.logger.debug("Cache file %s does not exist, removing from index", path)
+                self._remove_from_index(key)
+                return {
+                    "status": False,
+                }
 
-        if not path.exists():
-            self.logger.debug("Cache file %s does not exist, removing from index", path)
-            self._remove_from_index(key)
-            return {
-                "status": False,
-            }
+            if path.stat().st_mtime + ttl < time.time() and not self.is_pinned(key):
+                self.logger.debug("Cache file %s is older than the ttl, removing", path)
+                path.unlink(missing_ok=True)
+                self._remove_from_index(key)
+                return {
+                    "status": False,
+                }
 
-        if path.stat().st_mtime + ttl < time.time():
-            self.logger.debug("Cache file %s is older than the ttl, removing", path)
-            path.unlink()
-            self._remove_from_index(key)
-            return {
-                "status": False,
-            }
+            data["last_access"] = time.time()
+            data["hits"] = data.get("hits", 0) + 1
+            self._mark_index_dirty()
 
         self.logger.debug("Got path from cache under key %s", key)
         return {
             "status": True,
             "path": path,
+            "metadata": data.get("metadata", {}),
         }
 
     def _remove_from_index(self, key: str):
         """
-        Remove a given key from the index file.
+        Remove a given key from the index.
 
         Args:
             key (str): The key to remove from the index.
         """
-        index = self._get_index()
-        index.pop(key, None)  # Use pop with default to avoid KeyError
-        self._set_index(index)
+        with self._lock:
+            if self._index.pop(key, None) is not None:
+                self._mark_index_dirty()
+
+    def _entries(self):
+        """
+        Get all cache entries in the index.
+
+        Returns:
+            list: A list of (key, entry) tuples.
+        """
+        return [(key, entry) for key, entry in self._index.items() if isinstance(entry, dict)]
 
-    def add_file(self, key: str, file: Path, ttl: float = float("inf")):
+    def _entry_size(self, entry):
+        if "size" not in entry:
+            try:
+                entry["size"] = Path(entry["path"]).stat().st_size
+            except (OSError, KeyError, TypeError):
+                entry["size"] = 0
+        return entry["size"]
+
+    def _evict(self, key: str):
+        """
+        Remove an entry and its file from the cache.
+
+        Args:
+            key (str): The key to evict.
+
+        Returns:
+            int: The number of bytes reclaimed.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            self._remove_from_index(key)
+        if not isinstance(entry, dict) or "path" not in entry:
+            return 0
+        size = self._entry_size(entry)
+        try:
+            Path(entry["path"]).unlink(missing_ok=True)
+        except OSError as error:
+            # most likely the file is open elsewhere, the sweeper will pick it up later as an orphan
+            self.logger.warning("Failed to remove cache file %s: %s", entry["path"], error)
+            return 0
+        return size
+
+    def get_size(self):
+        """
+        Get the total size of all entries in the cache.
+
+        Returns:
+            int: The size in bytes.
+        """
+        with self._lock:
+            return sum(self._entry_size(entry) for _, entry in self._entries())
+
+    def _get_eviction_candidates(self, protected_key=None):
+        def sort_key(item):
+            entry = item[1]
+            if self.eviction_policy == "lfu":
+                return (entry.get("hits", 0), entry.get("last_access", 0))
+            return (entry.get("last_access", 0), )
+
+        with self._lock:
+            candidates = sorted((item for item in self._entries() if item[0] != protected_key), key=sort_key)
+            return [(key, self._entry_size(entry)) for key, entry in candidates]
+
+    def _get_stale_entries(self, now: float):
+        stale = []
+        with self._lock:
+            for key, entry in self._entries():
+                try:
+                    expiry = Path(entry["path"]).stat().st_mtime + entry["ttl"]
+                except (KeyError, TypeError, OSError):
+                    # invalid entry or the file no longer exists
+                    stale.append((key, False))
+                    continue
+                if expiry < now:
+                    stale.append((key, True))
+        return stale
+
+    def _get_referenced_paths(self):
+        with self._lock:
+            return {Path(entry["path"]).resolve() for _, entry in self._entries() if "path" in entry}
+
+    def _is_metadata_file(self, file):
+        return file == self.index_file
+
+    def add_file(self, key: str, file: Path, ttl: float = float("inf"), metadata: dict = None):
         """
         Add a file to the cache directory with the given key and ttl, which defaults to infinity.
 
@@ -178,14 +344,19 @@ class Cache:
             key (str): The key to store the file under.
             file (pathlib.Path): The file to store in the cache.
             ttl (float): The time to live for the data in the cache in seconds. Default is infinity.
-        """
-        if not self._is_index_file_valid():
-            self._create_index_file()
+            metadata (dict, optional): JSON serialisable data about the file, returned by get_file.
 
+        Returns:
+            dict: A dictionary with the status and the path of the file in the cache.
+        """
         self.logger.debug("Adding file to cache under key %s", key)
         cache_file = self.cache_directory / file.name
         shutil.move(file, cache_file)
-        self._add_path_to_index(key, cache_file, ttl)
+        self._add_path_to_index(key, cache_file, ttl, metadata)
+        return {
+            "status": True,
+            "path": cache_file,
+        }
 
     def get_file(self, key: str):
         """
@@ -195,29 +366,32 @@ class Cache:
             key (str): The key to get the file for.
 
         Returns:
-            dict: A dictionary with the status and path.
+            dict: A dictionary with the status, path and metadata.
         """
         return self._get_path_from_index(key)
 
     def add_json(self, key: str, data, ttl: float = float("inf")):
         """
         Create a JSON file in the cache directory with the given data.
-        Add the key and the path to the index file, with the ttl.
+        Add the key and the path to the index, with the ttl.
 
         Args:
             key (str): The key to store the data under.
             data: The data to store in the json file.
             ttl (float): The time to live for the data in the cache in seconds. Default is infinity.
-        """
-        if not self._is_index_file_valid():
-            self._create_index_file()
 
+        Returns:
+            dict: A dictionary with the status and the path of the JSON file.
+        """
         self.logger.debug("Adding dictionary to cache under key %s", key)
         cache_file = self.cache_directory / f"{key}.json"
-        with open(cache_file, "w", encoding="utf-8") as file:
-            json.dump(data, file)
+        self._write_atomic(cache_file, data)
 
         self._add_path_to_index(key, str(cache_file), ttl)
+        return {
+            "status": True,
+            "path": cache_file,
+        }
 
     def get_json(self, key: str):
         """
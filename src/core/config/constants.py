@@ -7,6 +7,12 @@ class App(Enum):
     VERSION = "0.14.0a1"
     SETTINGS_VERSION = 5
     CACHE_VERSION = 2
+    CACHE_MAX_SIZE = 1024 * 1024 * 1024
+    ARTIFACT_CACHE_MAX_SIZE = 4 * 1024 * 1024 * 1024
+    CACHE_SWEEP_INTERVAL = 60 * 30
+    # keys used by older versions of the app, their entries are removed when the cache is loaded
+    CACHE_RETIRED_KEYS = [r"TitleDB", r".+_icon", r".+_games"]
+    CACHE_BACKENDS = ["json", "sqlite"]
     GH_OWNER = "Viren070"
     GH_REPO = "EmuHaven"
     GH_ASSET_REGEX = r"EmuHaven.*\.zip"
@@ -16,6 +22,8 @@ class App(Enum):
     DEFAULT_COLOUR_THEMES = ["blue", "dark-blue", "green"]
     VALID_APPEARANCE_MODES = ["dark", "light"]
     RESULTS_PER_GAME_PAGE = 20
+    SEARCH_DEBOUNCE_DELAY = 150
+    GAME_ICON_SIZE = (224, 224)
 
 
 class GitHubOAuth(Enum):
@@ -109,3 +117,21 @@ class Requests(Enum):
         "Authorization": "BEARER {GH_TOKEN}",
         "X-GitHub-Api-Version": "2022-11-28",
     }
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 20
+    DOWNLOAD_CONNECTIONS = 4
+    SEGMENTED_DOWNLOAD_MIN_SIZE = 1024 * 1024 * 16
+
+
+class Events(Enum):
+    # The number of worker threads for each class of background event
+    WORKERS = {
+        "network": 6,
+        "disk": 2,
+        "cpu": 2,
+        # events that wait on an external process, such as a running emulator
+        "process": 4,
+        # downloading and resizing game icons, kept apart so that a page of icons does not hold up other downloads
+        "image": 4,
+    }
+    MAX_QUEUED_EVENTS = 100
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+from core.config import constants
 from core.config.assets import Assets
 from core.config.paths import Paths
 from core.emulators.dolphin.settings import DolphinSettings
@@ -23,6 +24,7 @@ class Settings:
             "auto_emulator_updates": True,
             "announcements_read": [],
             "firmware_denied": False,
+            "cache_backend": "json",
             "token": ""
 
         }
@@ -88,7 +90,8 @@ class Settings:
                 "delete_files_after_installing": "",
                 "auto_app_updates": "",
                 "auto_emulator_updates": "",
-                "firmware_denied": ""
+                "firmware_denied": "",
+                "cache_backend": ""
             }
         }
 
@@ -170,6 +173,7 @@ class Settings:
                 "auto_app_updates": self.auto_app_updates,
                 "auto_emulator_updates": self.auto_emulator_updates,
                 "firmware_denied": self.firmware_denied,
+                "cache_backend": self.cache_backend,
                 "announcements_read": self.announcements_read,
             }
         }
@@ -182,6 +186,9 @@ class Settings:
             if not self.assets.is_theme_valid(theme=value):
                 self.logger.error(f"Invalid theme receieved and resetting to default: {value}")
                 value = self.default_settings[property_name]
+        if property_name == "cache_backend" and value not in constants.App.CACHE_BACKENDS.value:
+            self.logger.error(f"Invalid cache backend receieved and resetting to default: {value}")
+            value = self.default_settings[property_name]
         self.logger.debug(f"Setting {property_name} to {value}")
         self._settings[property_name] = value
 
@@ -217,6 +224,10 @@ class Settings:
         lambda self: self._get_property("announcements_read"),
         lambda self, value: self._set_property("announcements_read", value),
     )
+    cache_backend = property(
+        lambda self: self._get_property("cache_backend"),
+        lambda self, value: self._set_property("cache_backend", value),
+    )
     token = property(
         lambda self: self._get_property("token"),
         lambda self, value: self._set_property("token", value),
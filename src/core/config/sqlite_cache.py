@@ -0,0 +1,287 @@
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from core.config import constants
+from core.config.base_cache import BaseCache
+from core.config.paths import Paths
+
+
+class SQLiteCache(BaseCache):
+    """
+    A drop-in alternative to Cache that keeps its index in an SQLite database.
+
+    Small JSON values are stored inline in the database, while files and large JSON values
+    are kept in the cache directory with their metadata in the database. The database uses
+    WAL mode and each thread gets its own connection, so lookups from worker threads do not
+    block each other.
+
+    Methods:
+        - add_file: Move a file into the cache.
+        - get_file: Get the path of a cached file.
+        - add_json: Store JSON data in the cache.
+        - get_json: Get JSON data from the cache.
+        - flush: Does nothing, every change is committed immediately.
+        - sweep: Remove expired entries and orphaned files.
+        - start_sweeper: Run sweep periodically in a background thread.
+    """
+    # JSON values larger than this are written to a file instead of being stored inline
+    INLINE_JSON_LIMIT = 1024 * 1024
+
+    def __init__(self, paths: Paths, max_size: int = constants.App.CACHE_MAX_SIZE.value, eviction_policy: str = "lru", cache_directory: Path = None):
+        super().__init__(paths, max_size, eviction_policy, cache_directory)
+        self.database_file = self.cache_directory / "cache.db"
+        self._local = threading.local()
+        self._create_schema()
+
+    def _get_connection(self):
+        """
+        Get the database connection for the current thread, creating it if needed.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_file, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _create_schema(self):
+        """
+        Create the entries table, or recreate it if it was created by a different cache version.
+        """
+        connection = self._get_connection()
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != constants.App.CACHE_VERSION.value:
+            self.logger.info("Creating cache database")
+            connection.execute("DROP TABLE IF EXISTS entries")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                data BLOB,
+                path TEXT,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                ttl REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                metadata TEXT
+            )
+            """
+        )
+        # databases created before entries had metadata
+        if "metadata" not in {row[1] for row in connection.execute("PRAGMA table_info(entries)")}:
+            connection.execute("ALTER TABLE entries ADD COLUMN metadata TEXT")
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        connection.execute(f"PRAGMA user_version = {int(constants.App.CACHE_VERSION.value)}")
+
+    def _put(self, key: str, data, path, size: int, ttl: float, metadata=None):
+        """
+        Insert or replace an entry, removing the file of the entry it replaces if it is different.
+        """
+        now = time.time()
+        path = str(path) if path is not None else None
+        metadata = json.dumps(metadata) if metadata else None
+        connection = self._get_connection()
+        previous = connection.execute("SELECT path FROM entries WHERE key = ?", (key, )).fetchone()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (key, data, path, size, created, ttl, last_access, hits, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)",
+            (key, data, path, size, now, ttl, now, metadata)
+        )
+        if previous is not None and previous[0] is not None and previous[0] != path:
+            Path(previous[0]).unlink(missing_ok=True)
+        self._enforce_size_limit(protected_key=key)
+
+    def _get(self, key: str):
+        """
+        Get an entry, removing it if it has expired or its file is missing.
+
+        Returns:
+            tuple: (data, path, metadata) of the entry, or None if there is no valid entry.
+        """
+        connection = self._get_connection()
+        row = connection.execute("SELECT data, path, created, ttl, metadata FROM entries WHERE key = ?", (key, )).fetchone()
+        if row is None:
+            self.logger.debug("Key %s not found in cache", key)
+            return None
+        data, path, created, ttl, metadata = row
+        if created + ttl < time.time() and not self.is_pinned(key):
+            self.logger.debug("Cache entry %s is older than the ttl, removing", key)
+            self._evict(key)
+            return None
+        if path is not None and not Path(path).exists():
+            self.logger.debug("Cache file %s does not exist, removing from index", path)
+            self._evict(key)
+            return None
+        connection.execute("UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return data, path, json.loads(metadata) if metadata else {}
+
+    def _evict(self, key: str):
+        """
+        Remove an entry and its file from the cache.
+
+        Returns:
+            int: The number of bytes reclaimed.
+        """
+        connection = self._get_connection()
+        row = connection.execute("SELECT path, size FROM entries WHERE key = ?", (key, )).fetchone()
+        if row is None:
+            return 0
+        connection.execute("DELETE FROM entries WHERE key = ?", (key, ))
+        path, size = row
+        if path is not None:
+            try:
+                Path(path).unlink(missing_ok=True)
+            except OSError as error:
+                self.logger.warning("Failed to remove cache file %s: %s", path, error)
+                return 0
+        return size
+
+    def get_size(self):
+        """
+        Get the total size of all entries in the cache.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return self._get_connection().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _get_eviction_candidates(self, protected_key=None):
+        order = "hits, last_access" if self.eviction_policy == "lfu" else "last_access"
+        return self._get_connection().execute(
+            f"SELECT key, size FROM entries WHERE key IS NOT ? ORDER BY {order}", (protected_key, )
+        ).fetchall()
+
+    def _get_stale_entries(self, now: float):
+        connection = self._get_connection()
+        stale = [(key, True) for (key, ) in connection.execute("SELECT key FROM entries WHERE created + ttl < ?", (now, ))]
+        for key, path in connection.execute("SELECT key, path FROM entries WHERE path IS NOT NULL AND created + ttl >= ?", (now, )).fetchall():
+            if not Path(path).exists():
+                stale.append((key, False))
+        return stale
+
+    def _get_referenced_paths(self):
+        return {Path(row[0]).resolve() for row in self._get_connection().execute("SELECT path FROM entries WHERE path IS NOT NULL")}
+
+    def _is_metadata_file(self, file):
+        return file.name.startswith(self.database_file.name)
+
+    def flush(self):
+        """
+        Kept for compatibility with Cache. Every change is committed immediately.
+        """
+
+    def add_file(self, key: str, file: Path, ttl: float = float("inf"), metadata: dict = None):
+        """
+        Add a file to the cache directory with the given key and ttl, which defaults to infinity.
+
+        Args:
+            key (str): The key to store the file under.
+            file (pathlib.Path): The file to store in the cache.
+            ttl (float): The time to live for the data in the cache in seconds. Default is infinity.
+            metadata (dict, optional): JSON serialisable data about the file, returned by get_file.
+
+        Returns:
+            dict: A dictionary with the status and the path of the file in the cache.
+        """
+        self.logger.debug("Adding file to cache under key %s", key)
+        cache_file = self.cache_directory / file.name
+        shutil.move(file, cache_file)
+        self._put(key, None, cache_file, cache_file.stat().st_size, ttl, metadata)
+        return {
+            "status": True,
+            "path": cache_file,
+        }
+
+    def get_file(self, key: str):
+        """
+        Get a file from the cache directory.
+
+        Args:
+            key (str): The key to get the file for.
+
+        Returns:
+            dict: A dictionary with the status, path and metadata.
+        """
+        entry = self._get(key)
+        if entry is None or entry[1] is None:
+            return {
+                "status": False,
+            }
+        self.logger.debug("Got path from cache under key %s", key)
+        return {
+            "status": True,
+            "path": Path(entry[1]),
+            "metadata": entry[2],
+        }
+
+    def add_json(self, key: str, data, ttl: float = float("inf")):
+        """
+        Store JSON data in the cache under the given key. Small values are stored in the
+        database itself and larger ones in a JSON file in the cache directory.
+
+        Args:
+            key (str): The key to store the data under.
+            data: The data to store.
+            ttl (float): The time to live for the data in the cache in seconds. Default is infinity.
+
+        Returns:
+            dict: A dictionary with the status and the path of the JSON file, which is None for inline values.
+        """
+        self.logger.debug("Adding dictionary to cache under key %s", key)
+        encoded = json.dumps(data).encode("utf-8")
+        if len(encoded) <= self.INLINE_JSON_LIMIT:
+            self._put(key, encoded, None, len(encoded), ttl)
+            return {
+                "status": True,
+                "path": None,
+            }
+        cache_file = self.cache_directory / f"{key}.json"
+        temp_file = cache_file.with_name(f"{cache_file.name}.{threading.get_ident()}.tmp")
+        temp_file.write_bytes(encoded)
+        temp_file.replace(cache_file)
+        self._put(key, None, cache_file, len(encoded), ttl)
+        return {
+            "status": True,
+            "path": cache_file,
+        }
+
+    def get_json(self, key: str):
+        """
+        Get JSON data from the cache. If the data is older than the ttl, it will be removed.
+
+        Args:
+            key (str): The key to get the data for.
+
+        Returns:
+            dict: A dictionary with the status and data.
+        """
+        entry = self._get(key)
+        if entry is None:
+            return {
+                "status": False,
+            }
+        data, path, _ = entry
+        try:
+            if data is not None:
+                contents = json.loads(data)
+            else:
+                with open(path, "r", encoding="utf-8") as file:
+                    contents = json.load(file)
+        except (OSError, json.JSONDecodeError) as error:
+            self.logger.error("Cache entry %s is not valid JSON, full error: %s", key, error)
+            return {
+                "status": False,
+            }
+        self.logger.debug("Got dictionary from cache under key %s", key)
+        return {
+            "status": True,
+            "data": contents,
+        }
@@ -9,9 +9,10 @@ import py7zr
 
 from core.config import constants
 from core.logging.logger import Logger
-from core.network.web import (download_file_with_progress,
-                              get_all_files_from_page)
-from core.utils.files import (copy_directory_with_progress,
+from core.network.web import (download_artifact, get_all_files_from_page,
+                              is_artifact_cached, open_remote_file)
+from core.utils.files import (CancellableReader, OperationCancelled,
+                              copy_directory_with_progress,
                               extract_zip_archive_with_progress)
 
 
@@ -24,6 +25,7 @@ class Dolphin:
     Available methods:
     - get_dolphin_release(release_channel)
     - download_release(release, progress_handler)
+    - open_release_stream(release)
     - extract_release(release, progress_handler)
     - delete_dolphin()
     - launch_dolphin()
@@ -50,7 +52,7 @@ class Dolphin:
         return (self.versions.get_version("dolphin") or "Unknown") if (self.settings.dolphin.install_directory / "Dolphin.exe").exists() else ""
 
     def _verify_dolphin_archive(self, path_to_archive):
-        if path_to_archive.endswith(".7z"):  # don't know how else to check if its valid for 7z
+        if Path(path_to_archive.name).suffix == ".7z":  # don't know how else to check if its valid for 7z
             return True
         try:
             with ZipFile(path_to_archive, 'r') as archive:
@@ -108,14 +110,33 @@ class Dolphin:
         return {"status": False, "message": "Unable to find a release for your system"}
 
     def download_release(self, release, progress_handler=None):
-        return download_file_with_progress(
+        return download_artifact(
             download_url=release["download_url"],
             download_path=Path(release["filename"]).resolve(),
+            version=release.get("version"),
             progress_handler=progress_handler,
+            expected_digest=release.get("digest"),
+            expected_size=release.get("size"),
         )
 
-    def extract_release(self, release: Path, progress_handler=None):
-        match release.suffix:
+    def open_release_stream(self, release):
+        if is_artifact_cached(release["download_url"], release.get("version")):
+            # extracting the stored copy is faster than streaming it from the server again
+            return {
+                "status": False,
+                "message": "The release is in the download cache",
+            }
+        if release.get("digest"):
+            # the digest can only be checked once the whole archive has been read, which is after it has been extracted
+            return {
+                "status": False,
+                "message": "The release must be downloaded to verify its digest",
+            }
+        return open_remote_file(release["download_url"], expected_size=release.get("size"))
+
+    def extract_release(self, release, progress_handler=None):
+        # release is either a path to the archive or a file object from open_release_stream
+        match Path(release.name).suffix:
             case ".zip":
                 if not self._verify_dolphin_archive(release):
                     return {
@@ -141,10 +162,20 @@ class Dolphin:
             # check for portable mode and temporarily move the user directory
             pass
         self.settings.dolphin.install_directory.mkdir(exist_ok=True, parents=True)
+        if hasattr(release_archive, "read"):
+            # py7zr cannot be stopped part way through, so a streamed release is cancelled by failing its reads
+            release_archive = CancellableReader(release_archive, progress_handler.should_cancel)
 
         try:
             with py7zr.SevenZipFile(release_archive, mode="r") as archive:
                 archive.extractall(path=self.settings.dolphin.install_directory)
+        except OperationCancelled:
+            progress_handler.cancel()
+            return {
+                "status": False,
+                "message": "Extraction cancelled",
+                "extracted_files": []
+            }
         except Exception as error:
             self.logger.error("Error extracting 7z archive: %s", error)
             return {
@@ -1,16 +1,25 @@
+import os
 import shutil
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from packaging import version
 
 from core.config import constants
 from core.network.github import get_all_releases, get_file_list
+from core.utils.files import copy_file_object, wait_for_workers
 from core.utils.progress_handler import ProgressHandler
-from core.network.web import download_file_with_progress
+from core.network.web import download_artifact, download_file_with_progress
+from core.utils.titledb import download_titledb_database
 
 
 class SwitchEmulator:
+    # NCAs are streamed to disk in chunks of this size instead of being read into memory whole
+    FIRMWARE_COPY_CHUNK_SIZE = 1024 * 1024 * 4
+    FIRMWARE_INSTALL_WORKERS = 4
+
     def __init__(self, emulator, emulator_settings, versions, firmware_path, key_path):
         """_summary_
 
@@ -27,7 +36,15 @@ class SwitchEmulator:
         self.key_path = key_path
 
     def get_user_directory(self):
-        return
+        """Get the user directory of the emulator, which holds its firmware and keys
+
+        Returns:
+            pathlib.Path: The user directory, or None if it is not known on this platform
+
+        Raises:
+            NotImplementedError: If the emulator does not support the current platform, as with a non-portable Yuzu outside Windows
+        """
+        raise NotImplementedError(f"{self.emulator} does not define a user directory")
 
     def get_firmware_path(self):
         return self.get_user_directory() / self.firmware_path
@@ -108,67 +125,173 @@ class SwitchEmulator:
             return False
 
     def download_firmware_release(self, release, progress_handler=None):
-        return download_file_with_progress(
+        return download_artifact(
             download_url=release["download_url"],
             download_path=Path(release["filename"]).resolve(),
             progress_handler=progress_handler,
+            version=release.get("version"),
+            expected_digest=release.get("digest"),
+            expected_size=release.get("size"),
         )
 
     def download_keys_release(self, release, progress_handler=None):
-        return download_file_with_progress(
+        return download_artifact(
             download_url=release["download_url"],
             download_path=Path(release["filename"]).resolve(),
             progress_handler=progress_handler,
+            version=release.get("version"),
+            downloader=download_file_with_progress,
+            expected_digest=release.get("digest"),
+            expected_size=release.get("size"),
         )
 
-    def install_firmware_from_archive(self, firmware_source, progress_handler=None):
+    @staticmethod
+    def get_nca_id(filename):
+        """Get the NCA ID of a firmware archive entry
+
+        Args:
+            filename (str): The name of the entry, either a flat NCA or an NCA directory containing 00
+
+        Returns:
+            str: The NCA ID, or None if the entry is not an NCA
+        """
+        if not (filename.endswith(".nca") or filename.endswith(".nca/00")):
+            return None
+        path_components = filename.replace(".cnmt", "").split("/")
+        nca_id = path_components[-1]
+        if nca_id == "00":
+            nca_id = path_components[-2]
+        if ".nca" not in nca_id:
+            return None
+        return nca_id
+
+    def get_nca_path(self, firmware_directory, nca_id):
+        """Get the path an NCA is installed to in this emulator's firmware layout
+
+        Args:
+            firmware_directory (pathlib.Path): The firmware directory
+            nca_id (str): The NCA ID
+
+        Returns:
+            pathlib.Path: The path of the NCA file
+        """
+        match self.emulator:
+            case "ryujinx":
+                return firmware_directory / nca_id / "00"
+            case "yuzu":
+                return firmware_directory / nca_id
+            case _:
+                raise ValueError(f"Emulator name {self.emulator} not recognized.")
+
+    def install_firmware_from_archive(self, firmware_source, progress_handler=None, emulators=None):
+        """Install the NCAs in a firmware archive, streaming each one to disk on a pool of threads
+
+        The firmware is installed into a staging directory next to the firmware directory, which then
+        replaces the installed firmware with a rename. The installed firmware is kept until every swap
+        has succeeded, so a failed or cancelled install leaves it untouched for all emulators. NCA IDs are derived from their contents,
+        so installed NCAs that are also in the archive are linked into the staging directory instead of
+        being extracted again.
+
+        When installing for several emulators, each NCA is decompressed once and then hardlinked into the
+        layout of every other emulator, or copied if their firmware directories are on different volumes.
+
+        Args:
+            firmware_source (pathlib.Path): The path to the firmware archive
+            progress_handler (ProgressHandler, optional): The progress handler, which is given progress in MiB
+            emulators (list, optional): The SwitchEmulator objects to install the firmware for. Defaults to only this one
+
+        Returns:
+            dict: A dictionary containing the status and message
+        """
         if progress_handler is None:
             progress_handler = ProgressHandler()
-        firmware_directory = self.get_firmware_path()
-        if firmware_directory.exists():
-            shutil.rmtree(firmware_directory)
-        firmware_directory.mkdir(parents=True, exist_ok=True)
-        extracted_files = []
+        if emulators is None:
+            emulators = [self]
+        # (emulator, firmware directory, staging directory) for every emulator to install to
+        targets = []
+        for emulator in emulators:
+            firmware_directory = emulator.get_firmware_path()
+            targets.append((emulator, firmware_directory, firmware_directory.with_name(firmware_directory.name + ".staging")))
+        installed_bytes = 0
+        progress_lock = threading.Lock()
+        stop_event = threading.Event()
+        # each worker reads the archive through its own handle
+        worker_archives = threading.local()
+        archives = []
+
+        def add_progress(size):
+            nonlocal installed_bytes
+            with progress_lock:
+                installed_bytes += size
+
+        def get_archive():
+            archive = getattr(worker_archives, "archive", None)
+            if archive is None:
+                archive = worker_archives.archive = zipfile.ZipFile(firmware_source, "r")
+                with progress_lock:
+                    archives.append(archive)
+            return archive
+
+        def install_nca(entry, nca_id):
+            if stop_event.is_set():
+                return
+            nca_paths = []
+            for emulator, _, staging_directory in targets:
+                nca_path = emulator.get_nca_path(staging_directory, nca_id)
+                nca_path.parent.mkdir(exist_ok=True)
+                nca_paths.append(nca_path)
+            # any emulator that already has this NCA installed can provide it
+            source_path = None
+            for emulator, firmware_directory, _ in targets:
+                installed_nca_path = emulator.get_nca_path(firmware_directory, nca_id)
+                if installed_nca_path.is_file() and installed_nca_path.stat().st_size == entry.file_size:
+                    source_path = installed_nca_path
+                    break
+            if source_path is None:
+                with get_archive().open(entry) as source, open(nca_paths[0], "wb") as target:
+                    if not copy_file_object(source, target, stop_event, add_progress, self.FIRMWARE_COPY_CHUNK_SIZE):
+                        return
+                source_path = nca_paths.pop(0)
+            else:
+                add_progress(entry.file_size)
+            for nca_path in nca_paths:
+                self._link_or_copy(source_path, nca_path)
+
+        def remove_staging_directories():
+            for _, _, staging_directory in targets:
+                shutil.rmtree(staging_directory, ignore_errors=True)
+
         rollback_needed = False
         try:
-            with zipfile.ZipFile(open(firmware_source, "rb"), 'r') as archive:
-                total = len(archive.namelist())
-                progress_handler.set_total_units(total)
-                for entry in archive.infolist():
-                    if progress_handler.should_cancel():
-                        progress_handler.cancel()
-                        rollback_needed = True
-                        break
-                    if not (entry.filename.endswith(".nca") or entry.filename.endswith(".nca/00")):
-                        continue
-                    path_components = entry.filename.replace(".cnmt", "").split("/")
-                    nca_id = path_components[-1]
-                    if nca_id == "00":
-                        nca_id = path_components[-2]
-                    if ".nca" not in nca_id:
-                        progress_handler.set_total_units(total - 1)
-                        continue
-                    new_path = firmware_directory / nca_id
-                    if self.emulator == "ryujinx":
-                        new_path.mkdir(exist_ok=True)
-                        with open((new_path / "00"), "wb") as f:
-                            f.write(archive.read(entry))
-                    elif self.emulator == "yuzu":
-                        firmware_directory.mkdir(exist_ok=True)
-                        with open(new_path, "wb") as f:
-                            f.write(archive.read(entry))
-                    extracted_files.append(entry.filename)
-                    progress_handler.report_progress(len(extracted_files))
-
+            with zipfile.ZipFile(firmware_source, "r") as archive:
+                ncas = [(entry, nca_id) for entry in archive.infolist() if (nca_id := self.get_nca_id(entry.filename)) is not None]
+            progress_handler.set_total_units(sum(entry.file_size for entry, _ in ncas) / 1024 / 1024)
+            for _, _, staging_directory in targets:
+                if staging_directory.exists():
+                    # left behind by an install that was interrupted
+                    shutil.rmtree(staging_directory)
+                staging_directory.mkdir(parents=True)
+            # start the largest NCAs first so that one is not left running on its own at the end
+            ncas.sort(key=lambda nca: nca[0].file_size, reverse=True)
+            with ThreadPoolExecutor(max_workers=self.FIRMWARE_INSTALL_WORKERS, thread_name_prefix="firmware") as executor:
+                futures = [executor.submit(install_nca, entry, nca_id) for entry, nca_id in ncas]
+                rollback_needed = not wait_for_workers(futures, progress_handler, lambda: installed_bytes / 1024 / 1024, stop_event)
+            if not rollback_needed:
+                self._swap_firmware_directories(targets)
         except Exception as error:
+            remove_staging_directories()
             progress_handler.report_error(error)
             return {
                 "status": False,
                 "message": f"Failed to extract firmware archive: {error}",
             }
+        finally:
+            for archive in archives:
+                archive.close()
 
         if rollback_needed:
-            shutil.rmtree(firmware_directory)
+            progress_handler.cancel()
+            remove_staging_directories()
             return {
                 "status": False,
                 "message": "The installation was cancelled by the user",
@@ -180,6 +303,100 @@ class SwitchEmulator:
             "message": "Firmware extracted successfully",
         }
 
+    def has_user_directory(self):
+        """Check if the emulator has been set up, so that firmware and keys can be installed for it
+
+        Returns:
+            bool: True if the user directory exists, False otherwise
+        """
+        try:
+            user_directory = self.get_user_directory()
+        except NotImplementedError:
+            # see get_user_directory, Yuzu raises this outside Windows unless it is in portable mode
+            return False
+        return user_directory is not None and user_directory.is_dir()
+
+    @staticmethod
+    def _link_or_copy(source, destination):
+        """Hardlink a file, or copy it if the file system does not support hardlinks
+
+        Args:
+            source (pathlib.Path): The file to link to
+            destination (pathlib.Path): The path of the new link
+        """
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def _swap_firmware_directories(self, targets):
+        """Move the staging directory of every target into place, all or nothing
+
+        If a swap fails, the targets that were already swapped get their previous firmware back,
+        so that no emulator is left on a different version than the user was told.
+
+        Args:
+            targets (list): (emulator, firmware directory, staging directory) tuples
+        """
+        swapped = []
+        try:
+            for emulator, firmware_directory, staging_directory in targets:
+                swapped.append((emulator, firmware_directory, self._swap_directories(staging_directory, firmware_directory)))
+        except OSError as error:
+            not_restored = []
+            for emulator, firmware_directory, old_directory in reversed(swapped):
+                try:
+                    self._restore_directory(firmware_directory, old_directory)
+                except OSError:
+                    not_restored.append(emulator.emulator.capitalize())
+            if not_restored:
+                raise OSError(f"{error}. The firmware was updated for {", ".join(not_restored)} but could not be rolled back") from error
+            raise
+        for _, _, old_directory in swapped:
+            if old_directory is not None:
+                shutil.rmtree(old_directory, ignore_errors=True)
+
+    @staticmethod
+    def _swap_directories(new_directory, directory):
+        """Replace a directory with another one on the same volume using renames
+
+        The replaced directory is moved aside rather than deleted, so that the swap can be undone with
+        _restore_directory. It is put back straight away if the swap itself fails.
+
+        Args:
+            new_directory (pathlib.Path): The directory to move into place
+            directory (pathlib.Path): The directory to replace, which may not exist
+
+        Returns:
+            pathlib.Path: The replaced directory, or None if there was none. The caller deletes it once the swap is final
+        """
+        old_directory = directory.with_name(directory.name + ".old")
+        if old_directory.exists():
+            shutil.rmtree(old_directory)
+        if directory.exists():
+            directory.rename(old_directory)
+        else:
+            old_directory = None
+        try:
+            new_directory.rename(directory)
+        except OSError:
+            if old_directory is not None:
+                old_directory.rename(directory)
+            raise
+        return old_directory
+
+    @staticmethod
+    def _restore_directory(directory, old_directory):
+        """Undo _swap_directories, putting back the directory it replaced
+
+        Args:
+            directory (pathlib.Path): The directory that was moved into place
+            old_directory (pathlib.Path): The directory returned by _swap_directories
+        """
+        shutil.rmtree(directory)
+        if old_directory is not None:
+            old_directory.rename(directory)
+
     def install_keys_from_file(self, key_path):
         if not key_path.exists():
             return {
@@ -282,6 +499,7 @@ class SwitchEmulator:
                         "filename": asset["name"].replace("Alpha", "Firmware"),
                         "download_url": asset["browser_download_url"],
                         "size": asset["size"],
+                        "digest": asset.get("digest"),
                         "version": release["tag_name"],
                     }
                 elif "Rebootless" not in asset["name"] and "Beta" in asset["name"]:
@@ -289,6 +507,7 @@ class SwitchEmulator:
                         "filename": asset["name"].replace("Beta", "Keys"),
                         "download_url": asset["browser_download_url"],
                         "size": asset["size"],
+                        "digest": asset.get("digest"),
                         "version": release["tag_name"],
                     }
 
@@ -305,9 +524,9 @@ class SwitchEmulator:
 
     @staticmethod
     def download_titledb(progress_handler=None):
-        return download_file_with_progress(
+        return download_titledb_database(
             download_url=constants.Switch.TITLEDB_DOWNLOAD_URL.value,
-            download_path=Path(constants.Switch.TITLEDB_FILENAME.value).resolve(),
+            database_path=Path(constants.Switch.TITLEDB_FILENAME.value).with_suffix(".db").resolve(),
             progress_handler=progress_handler,
         )
 
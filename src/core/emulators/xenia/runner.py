@@ -10,7 +10,7 @@ from core.config import constants
 from core.logging.logger import Logger
 from core.utils.files import extract_zip_archive_with_progress, copy_directory_with_progress
 from core.network.github import get_latest_release_with_asset
-from core.network.web import download_file_with_progress
+from core.network.web import download_artifact, is_artifact_cached, open_remote_file
 
 
 class Xenia:
@@ -61,14 +61,33 @@ class Xenia:
         )
 
     def download_xenia_release(self, release, progress_handler=None):
-        return download_file_with_progress(
+        return download_artifact(
             download_url=release["download_url"],
             download_path=Path(release["filename"]).resolve(),
+            version=release.get("version"),
             progress_handler=progress_handler,
+            expected_digest=release.get("digest"),
+            expected_size=release.get("size"),
         )
 
+    def open_release_stream(self, release):
+        if is_artifact_cached(release["download_url"], release.get("version")):
+            # extracting the stored copy is faster than streaming it from the server again
+            return {
+                "status": False,
+                "message": "The release is in the download cache",
+            }
+        if release.get("digest"):
+            # the digest can only be checked once the whole archive has been read, which is after it has been extracted
+            return {
+                "status": False,
+                "message": "The release must be downloaded to verify its digest",
+            }
+        return open_remote_file(release["download_url"], expected_size=release.get("size"))
+
     def extract_xenia_release(self, release, progress_handler=None):
-        if release.suffix != ".zip":
+        # release is either a path to the archive or a file object from open_release_stream
+        if Path(release.name).suffix != ".zip":
             return {
                     "status": False,
                     "message": "Unsupported archive type",
@@ -18,9 +18,8 @@ def get_headers(token=None):
 
 def get_all_releases(repo_owner, repo_name, token=None):
     logger.debug("Getting all releases for %s/%s", repo_owner, repo_name)
-    response = web.get(GitHub.API_RELEASES.value.format(owner=repo_owner, repo=repo_name), headers=get_headers(token))
+    response = web.get_json(GitHub.API_RELEASES.value.format(owner=repo_owner, repo=repo_name), headers=get_headers(token))
     if response["status"]:
-        response["response"] = response["response"].json()
         return response
     logger.error("Failed to get all releases: %s", response)
     return response
@@ -29,15 +28,13 @@ def get_all_releases(repo_owner, repo_name, token=None):
 def get_latest_release(repo_owner, repo_name, token=None, include_prereleases=False):
     logger.debug("Getting latest release for %s/%s", repo_owner, repo_name)
     if include_prereleases:
-        response = web.get(GitHub.API_RELEASES.value.format(owner=repo_owner, repo=repo_name), headers=get_headers(token))
+        response = web.get_json(GitHub.API_RELEASES.value.format(owner=repo_owner, repo=repo_name), headers=get_headers(token))
         if response["status"]:
-            response["response"] = response["response"].json()
             response["response"] = response["response"][0]
             return response
     else:
-        response = web.get(GitHub.API_LATEST_RELEASE.value.format(owner=repo_owner, repo=repo_name), headers=get_headers(token))
+        response = web.get_json(GitHub.API_LATEST_RELEASE.value.format(owner=repo_owner, repo=repo_name), headers=get_headers(token))
         if response["status"]:
-            response["response"] = response["response"].json()
             return response
     logger.error("Failed to get latest release: %s", response)
     return response
@@ -68,6 +65,7 @@ def get_latest_release_with_asset(repo_owner, repo_name, regex, token=None, use_
         - release: A dict with keys:
             - version: The version of the release
             - size: The size of the asset
+            - digest: The digest of the asset as "<algorithm>:<hex>", or None if GitHub did not provide one
             - download_url: The download url of the asset
             - filename: The name of the asset
 
@@ -75,6 +73,7 @@ def get_latest_release_with_asset(repo_owner, repo_name, regex, token=None, use_
     release = {
         "version": None,
         "size": None,
+        "digest": None,
         "download_url": None,
         "filename": None,
     }
@@ -102,6 +101,7 @@ def get_latest_release_with_asset(repo_owner, repo_name, regex, token=None, use_
     release = {
         "version": version if not use_commit_as_version else latest_release["response"].get("target_commitish"),
         "size": asset.get("size"),
+        "digest": asset.get("digest"),
         "download_url": asset.get("browser_download_url"),
         "filename": asset.get("name"),
 
@@ -115,9 +115,8 @@ def get_latest_release_with_asset(repo_owner, repo_name, regex, token=None, use_
 
 def get_file_list(repo_owner, repo_name, path, token=None):
     logger.debug("Getting file list for %s/%s/%s", repo_owner, repo_name, path)
-    response = web.get(GitHub.API_CONTENTS.value.format(owner=repo_owner, repo=repo_name, path=path), headers=get_headers(token))
+    response = web.get_json(GitHub.API_CONTENTS.value.format(owner=repo_owner, repo=repo_name, path=path), headers=get_headers(token))
     if response["status"]:
-        response["response"] = response["response"].json()
         return response
     logger.error("Failed to get file list: %s", response)
     return response
@@ -1,7 +1,34 @@
+import re
+
 from core.config.constants import Myrient
+from core.logging.logger import Logger
 from core.network.web import get_all_files_from_page
 from urllib.parse import quote, unquote
 
+logger = Logger(__name__).get_logger()
+
+# Region names used in No-Intro and Redump tags
+REGIONS = {
+    "World", "USA", "Europe", "Japan", "Argentina", "Asia", "Australia", "Austria", "Belgium", "Brazil", "Canada",
+    "China", "Croatia", "Denmark", "Finland", "France", "Germany", "Greece", "Hong Kong", "India", "Ireland", "Italy",
+    "Korea", "Latin America", "Mexico", "Netherlands", "New Zealand", "Norway", "Poland", "Portugal", "Russia",
+    "Scandinavia", "South Africa", "Spain", "Sweden", "Switzerland", "Taiwan", "UK", "Unknown",
+}
+# The language implied by a region when a title has no language tag,
+# regions with more than one official language such as Belgium and Switzerland are left out
+REGION_LANGUAGES = {
+    "USA": "En", "UK": "En", "Australia": "En", "Canada": "En", "Ireland": "En", "New Zealand": "En",
+    "South Africa": "En", "Japan": "Ja", "France": "Fr", "Germany": "De", "Austria": "De", "Italy": "It",
+    "Spain": "Es", "Argentina": "Es", "Netherlands": "Nl", "Korea": "Ko", "China": "Zh", "Taiwan": "Zh",
+    "Hong Kong": "Zh", "Brazil": "Pt", "Portugal": "Pt", "Russia": "Ru", "Sweden": "Sv", "Poland": "Pl",
+    "Greece": "El", "Denmark": "Da", "Finland": "Fi", "Norway": "No", "Croatia": "Hr",
+}
+_TAG_PATTERN = re.compile(r"\(([^()]*)\)|\[([^\[\]]*)\]")
+_LANGUAGE_PATTERN = re.compile(r"[A-Z][a-z](?:-[A-Za-z]+)?")
+_REVISION_PATTERN = re.compile(r"Rev ([\w.]+)")
+_VERSION_PATTERN = re.compile(r"v(\d[\w.]*)")
+_DISC_PATTERN = re.compile(r"Disc (\d+)(?: of \d+)?")
+
 
 def get_list_of_games(myrient_path):
     scrape_result = get_all_files_from_page(url=Myrient.BASE_URL.value + myrient_path, file_ext=".zip")
@@ -9,12 +36,137 @@ def get_list_of_games(myrient_path):
         return scrape_result
     scrape_result["games"] = []
     for file in scrape_result["files"]:
-        # Remove the base URL and the myrient path from the filename
-        # this will return a list of filenames that are relative to the myrient path
-        scrape_result["games"].append(unquote(file.replace(Myrient.BASE_URL.value + myrient_path, "").replace(".zip", "")))
+        game_name = _get_game_name(file, myrient_path)
+        if game_name is not None:
+            scrape_result["games"].append(game_name)
 
     return scrape_result
 
 
+def _get_game_name(file_url, myrient_path):
+    """
+    Get the name of a game from the URL of its file in a Myrient directory.
+
+    Args:
+        file_url (str): The URL of the file.
+        myrient_path (str): The path of the directory relative to the Myrient base URL.
+
+    Returns:
+        str: The file name without the directory and extension, or None if the file is not directly in the directory.
+    """
+    # the URL may or may not be percent-encoded, so compare the unquoted forms
+    directory_url = unquote(Myrient.BASE_URL.value + myrient_path)
+    file_url = unquote(file_url)
+    if not file_url.startswith(directory_url):
+        logger.warning("Skipping %s as it is not in %s", file_url, directory_url)
+        return None
+    game_name = file_url.removeprefix(directory_url).removesuffix(".zip")
+    if not game_name or "/" in game_name:
+        logger.warning("Skipping %s as it is not a game in %s", file_url, directory_url)
+        return None
+    return game_name
+
+
+def get_catalogue(myrient_path):
+    """
+    Get the games in a Myrient directory along with their size, modification time and download URL.
+
+    Args:
+        myrient_path (str): The path of the directory relative to the Myrient base URL.
+
+    Returns:
+        dict: A dictionary with the status, message and catalogue, which maps each game name to a
+            dictionary with fields: size (int or None), modified (UTC timestamp or None) and url (str).
+    """
+    scrape_result = get_all_files_from_page(url=Myrient.BASE_URL.value + myrient_path, file_ext=".zip")
+    if not scrape_result["status"]:
+        return scrape_result
+    scrape_result["catalogue"] = {}
+    for entry in scrape_result["entries"]:
+        game_name = _get_game_name(entry["url"], myrient_path)
+        if game_name is None:
+            continue
+        scrape_result["catalogue"][game_name] = {
+            "size": entry["size"],
+            "modified": entry["modified"],
+            "url": entry["url"],
+        }
+    return scrape_result
+
+
+def diff_catalogues(old_catalogue, new_catalogue):
+    """
+    Compare two catalogues returned by get_catalogue.
+
+    Args:
+        old_catalogue (dict): The stored catalogue.
+        new_catalogue (dict): The freshly fetched catalogue.
+
+    Returns:
+        dict: A dictionary with fields: added (dict of the entries that are new or whose size or
+            modification time changed) and removed (list of the names that no longer exist).
+    """
+    return {
+        "added": {name: entry for name, entry in new_catalogue.items() if old_catalogue.get(name) != entry},
+        "removed": [name for name in old_catalogue if name not in new_catalogue],
+    }
+
+
+def apply_catalogue_diff(catalogue, diff):
+    """
+    Apply a diff returned by diff_catalogues to a catalogue in place.
+
+    Returns:
+        dict: The updated catalogue.
+    """
+    for name in diff["removed"]:
+        catalogue.pop(name, None)
+    catalogue.update(diff["added"])
+    return catalogue
+
+
 def get_game_download_url(game_name, myrient_path):
     return Myrient.BASE_URL.value + myrient_path + f"{quote(game_name)}.zip"
+
+
+def parse_game_name(game_name):
+    """
+    Parse the tags of a No-Intro or Redump game name, such as "Title (USA, Europe) (En,Fr) (Rev 1) (Disc 2)".
+
+    Args:
+        game_name (str): The name of the game.
+
+    Returns:
+        dict: A dictionary with the title, regions, languages, revision, version, disc and any other tags as flags.
+    """
+    tag_start = _TAG_PATTERN.search(game_name)
+    game_info = {
+        "title": (game_name[:tag_start.start()] if tag_start else game_name).strip(),
+        "regions": [],
+        "languages": [],
+        "revision": None,
+        "version": None,
+        "disc": None,
+        "flags": [],
+    }
+    for match in _TAG_PATTERN.finditer(game_name):
+        tag = match.group(1) if match.group(1) is not None else match.group(2)
+        parts = [part.strip() for part in tag.split(",")]
+        if all(part in REGIONS for part in parts):
+            game_info["regions"].extend(parts)
+        elif all(_LANGUAGE_PATTERN.fullmatch(part) for part in parts):
+            game_info["languages"].extend(parts)
+        elif revision := _REVISION_PATTERN.fullmatch(tag):
+            game_info["revision"] = revision.group(1)
+        elif version := _VERSION_PATTERN.fullmatch(tag):
+            game_info["version"] = version.group(1)
+        elif disc := _DISC_PATTERN.fullmatch(tag):
+            game_info["disc"] = int(disc.group(1))
+        else:
+            game_info["flags"].append(tag)
+
+    if not game_info["languages"]:
+        game_info["languages"] = list(dict.fromkeys(
+            REGION_LANGUAGES[region] for region in game_info["regions"] if region in REGION_LANGUAGES
+        ))
+    return game_info
@@ -1,9 +1,21 @@
+import calendar
+import codecs
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import unquote, urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 
 from core.config import constants
 from core.logging.logger import Logger
@@ -11,6 +23,69 @@ from core.utils.progress_handler import ProgressHandler
 
 logger = Logger(__name__).get_logger()
 
+_session = None
+_session_lock = threading.Lock()
+_response_cache = None
+_artifact_cache = None
+
+
+def _create_session(pool_connections, pool_maxsize, pool_block):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure_session(pool_connections=constants.Requests.POOL_CONNECTIONS.value, pool_maxsize=constants.Requests.POOL_MAXSIZE.value, pool_block=False):
+    """Replace the shared session with one using the given connection pool sizes.
+
+    Args:
+        pool_connections (int, optional): The number of hosts to keep a connection pool for.
+        pool_maxsize (int, optional): The maximum number of keep-alive connections kept per host.
+        pool_block (bool, optional): Whether to wait for a free connection instead of opening a
+            throwaway one once a host's pool is exhausted. Defaults to False.
+    """
+    global _session
+    logger.debug("Configuring session with %s host pools of size %s", pool_connections, pool_maxsize)
+    with _session_lock:
+        old_session = _session
+        _session = _create_session(pool_connections, pool_maxsize, pool_block)
+    if old_session is not None:
+        old_session.close()
+
+
+def get_session():
+    """Get the process-wide session used for all requests.
+
+    The session keeps a pool of keep-alive connections for each host so that
+    repeated requests to the same host (e.g. the GitHub API or Myrient) do not
+    pay for a new TCP and TLS handshake every time.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session(
+                    constants.Requests.POOL_CONNECTIONS.value,
+                    constants.Requests.POOL_MAXSIZE.value,
+                    False
+                )
+    return _session
+
+
+def close_session():
+    """Close the shared session and release all pooled connections."""
+    global _session
+    with _session_lock:
+        old_session = _session
+        _session = None
+    if old_session is not None:
+        old_session.close()
+
 
 def get(url, timeout=30, headers=constants.Requests.DEFAULT_HEADERS.value, **kwargs):
     """Create a GET request to the given URL.
@@ -25,7 +100,7 @@ def get(url, timeout=30, headers=constants.Requests.DEFAULT_HEADERS.value, **kwa
     """
     try:
         logger.debug("GET %s  %s", url, kwargs)
-        response = requests.get(url, timeout=timeout, headers=headers, **kwargs)
+        response = get_session().get(url, timeout=timeout, headers=headers, **kwargs)
         response.raise_for_status()
     except requests.exceptions.RequestException as error:
         logger.error("GET Error: %s", error)
@@ -48,7 +123,7 @@ def post(url, data=None, json=None, timeout=30, headers=constants.Requests.DEFAU
     """
     try:
         logger.debug("POST %s %s", url, kwargs)
-        response = requests.post(url, data=data, json=json, timeout=timeout, headers=headers, **kwargs)
+        response = get_session().post(url, data=data, json=json, timeout=timeout, headers=headers, **kwargs)
         response.raise_for_status()
     except requests.exceptions.RequestException as error:
         logger.error("POST Error: %s", error)
@@ -56,41 +131,401 @@ def post(url, data=None, json=None, timeout=30, headers=constants.Requests.DEFAU
     return {"status": True, "message": "Request successful", "response": response}
 
 
-def get_all_files_from_page(url, file_ext=None, **kwargs):
+def set_response_cache(cache):
+    """Set the cache used to store JSON responses and their validators for get_json.
+
+    Args:
+        cache (core.config.cache.Cache): The cache to store responses in, or None to disable storing.
+    """
+    global _response_cache
+    _response_cache = cache
+
+
+def set_artifact_cache(cache):
+    """Set the cache used to store downloads for download_artifact.
+
+    Downloads are much larger than responses and icons, so they are kept in a separate cache with its own size limit.
+
+    Args:
+        cache (core.config.cache.Cache): The cache to store downloads in, or None to disable storing.
+    """
+    global _artifact_cache
+    _artifact_cache = cache
+
+
+def _get_response_cache_key(url, headers):
+    # responses differ depending on who is authenticated, so the token is part of the key
+    identity = f"{url}\0{headers.get('Authorization', '')}"
+    return "http_" + hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+def get_json(url, headers=constants.Requests.DEFAULT_HEADERS.value, **kwargs):
+    """Create a conditional GET request to the given URL and parse the response as JSON.
+
+    If a previous response for the same URL was stored with an ETag or Last-Modified header,
+    the request is sent with If-None-Match/If-Modified-Since and a 304 Not Modified response
+    is served from the stored body.
+
+    Args:
+        url (str): URL to make the request to.
+        headers (dict, optional): Headers to include in the request.
+
+    Returns:
+        dict: A dictionary with fields: status (bool), message (str) and response (the decoded JSON)
+    """
+    cache = _response_cache
+    request_headers = dict(headers)
+    stored = None
+    if cache is not None:
+        cache_key = _get_response_cache_key(url, headers)
+        lookup = cache.get_json(cache_key)
+        if lookup["status"] and isinstance(lookup["data"], dict) and "body" in lookup["data"]:
+            stored = lookup["data"]
+            if stored.get("etag"):
+                request_headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                request_headers["If-Modified-Since"] = stored["last_modified"]
+
+    response = get(url, headers=request_headers, **kwargs)
+    if not response["status"]:
+        return response
+    response = response["response"]
+    if response.status_code == 304 and stored is not None:
+        logger.debug("%s not modified, using stored response", url)
+        return {"status": True, "message": "Not modified", "response": stored["body"]}
+
+    try:
+        data = response.json()
+    except ValueError as error:
+        logger.error("Invalid JSON received from %s: %s", url, error)
+        return {"status": False, "message": error}
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache is not None and (etag or last_modified):
+        cache.add_json(cache_key, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": data,
+        })
+    return {"status": True, "message": "Request successful", "response": data}
+
+
+def _get_artifact_cache_key(download_url, version):
+    identity = f"{download_url}\0{version or ''}"
+    return "artifact_" + hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+def is_artifact_cached(download_url, version=None):
+    """Check whether a download is stored in the artifact store.
+
+    Args:
+        download_url (str): The URL of the download.
+        version (str, optional): The version of the release the download belongs to.
+
+    Returns:
+        bool: True if download_artifact would serve the download from the cache.
+    """
+    if _artifact_cache is None:
+        return False
+    return _artifact_cache.get_file(_get_artifact_cache_key(download_url, version))["status"]
+
+
+def _restore_artifact(artifact_path, metadata, download_path, progress_handler, expected_digest, expected_size):
+    size = artifact_path.stat().st_size
+    if expected_size is not None and size != expected_size:
+        return f"Expected {expected_size} bytes but the stored file has {size} bytes"
+    algorithm, _, expected = (expected_digest or "").rpartition(":")
+    # the sha256 of the stored file is kept in its cache entry when it is stored
+    digest = (metadata or {}).get("sha256")
+    if expected and (algorithm or "sha256") == "sha256" and digest != expected.lower():
+        return f"Expected sha256 digest {expected} but the stored file has digest {digest}"
+    progress_handler.set_total_units(size / 1024 / 1024)
+    download_path.unlink(missing_ok=True)
+    try:
+        os.link(artifact_path, download_path)
+    except OSError:
+        shutil.copyfile(artifact_path, download_path)
+    progress_handler.report_progress(size / 1024 / 1024)
+    progress_handler.report_success()
+    return None
+
+
+def _store_artifact(cache, cache_key, download_path, expected_digest):
+    algorithm, _, digest = (expected_digest or "").rpartition(":")
+    if not digest or (algorithm or "sha256") != "sha256":
+        hasher = hashlib.sha256()
+        _hash_file(download_path, hasher)
+        digest = hasher.hexdigest()
+    # the key is part of the name so that entries never share a file, evicting one cannot remove another's file
+    artifact_path = download_path.with_name(f"{cache_key}_{digest.lower()}{download_path.suffix}")
+    try:
+        artifact_path.unlink(missing_ok=True)
+        try:
+            os.link(download_path, artifact_path)
+        except OSError:
+            shutil.copyfile(download_path, artifact_path)
+        cache.add_file(cache_key, artifact_path, metadata={"sha256": digest.lower()})
+    except OSError as error:
+        logger.warning("Failed to store %s in the artifact store: %s", download_path, error)
+        artifact_path.unlink(missing_ok=True)
+
+
+def download_artifact(download_url, download_path, progress_handler=None, version=None, expected_digest=None, expected_size=None, downloader=None, **kwargs):
+    """Download a release asset through the artifact store, so that downloading it again is served from disk.
+
+    Downloads are stored in the cache set with set_artifact_cache under a key made from their URL and
+    version, with the sha256 digest of their contents kept in the cache entry, and are evicted once
+    that cache is over its size limit. A stored download is checked against the expected size
+    and digest and then hardlinked or copied to download_path, so the caller can delete download_path
+    once it has been installed.
+
+    Args:
+        download_url (str): URL to download the file from.
+        download_path (pathlib.Path): Path to save the downloaded file to.
+        progress_handler (ProgressHandler, optional): Progress handler to update the download progress.
+        version (str, optional): The version of the release the download belongs to.
+        expected_digest (str, optional): The expected digest of the file as "<algorithm>:<hex>".
+        expected_size (int, optional): The expected size of the file in bytes.
+        downloader (callable, optional): The function used to download the file. Defaults to download_file_segmented.
+
+    Returns:
+        dict: The result of the downloader, with fields: status (bool), message (str) and download_path.
+    """
+    if downloader is None:
+        downloader = download_file_segmented
+    if progress_handler is None:
+        progress_handler = ProgressHandler()
+    cache = _artifact_cache
+    cache_key = _get_artifact_cache_key(download_url, version)
+    if cache is not None:
+        lookup = cache.get_file(cache_key)
+        if lookup["status"]:
+            try:
+                mismatch = _restore_artifact(Path(lookup["path"]), lookup.get("metadata"), download_path, progress_handler, expected_digest, expected_size)
+            except OSError as error:
+                mismatch = error
+            if mismatch is None:
+                logger.info("Serving %s from the artifact store", download_url)
+                return {"status": True, "message": "Download served from cache", "download_path": download_path}
+            logger.warning("Stored copy of %s is invalid, downloading again: %s", download_url, mismatch)
+
+    result = downloader(
+        download_url=download_url,
+        download_path=download_path,
+        progress_handler=progress_handler,
+        expected_digest=expected_digest,
+        expected_size=expected_size,
+        **kwargs
+    )
+    if result["status"] and cache is not None:
+        _store_artifact(cache, cache_key, Path(result["download_path"]), expected_digest)
+    return result
+
+
+def head(url, timeout=30, headers=constants.Requests.DEFAULT_HEADERS.value, allow_redirects=True, **kwargs):
+    """Create a HEAD request to the given URL.
+
+    Args:
+        url (str): URL to make the request to.
+        headers (dict, optional): Headers to include in the request.
+        timeout (int, optional): The timeout for the request. Defaults to 30.
+        allow_redirects (bool, optional): Whether to follow redirects. Defaults to True.
+
+    Returns:
+        dict: A dictionary with fields: status (bool) and message (str or requests.Response)
+    """
+    try:
+        logger.debug("HEAD %s  %s", url, kwargs)
+        response = get_session().head(url, timeout=timeout, headers=headers, allow_redirects=allow_redirects, **kwargs)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as error:
+        logger.error("HEAD Error: %s", error)
+        return {"status": False, "message": error}
+    return {"status": True, "message": "Request successful", "response": response}
+
+
+_LISTING_ANCHOR_START = re.compile(r"<a\s", re.IGNORECASE)
+_LISTING_HREF = re.compile(r"""<a\s[^>]*?href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_LISTING_TAG = re.compile(r"<[^>]*>")
+# a relative link without a scheme, query, fragment or dot segments
+_LISTING_PLAIN_HREF = re.compile(r"(?![./])[^:/?#]+(?:/[^/?#.][^/?#]*)*(?<!/\.)$")
+_LISTING_DATES = (
+    re.compile(r"(?P<day>\d{1,2})-(?P<month>[A-Za-z]{3})-(?P<year>\d{4}) (?P<hour>\d{2}):(?P<minute>\d{2})"),
+    re.compile(r"(?P<year>\d{4})-(?P<month>[A-Za-z]{3})-(?P<day>\d{1,2}) (?P<hour>\d{2}):(?P<minute>\d{2})"),
+    re.compile(r"(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2}) (?P<hour>\d{2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?"),
+)
+_MONTHS = {month.lower(): number for number, month in enumerate(calendar.month_abbr) if month}
+_LISTING_SIZE = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)\s*([KMGTP]?)(?:i?B)?(?![\w.])", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4, "P": 1024 ** 5}
+
+
+def _parse_listing_columns(text):
+    """Get the modification time and size from the text that follows a link in a directory listing.
+
+    Returns:
+        tuple: The modification time as a UTC timestamp and the size in bytes, either of which may be None.
+    """
+    modified = None
+    for pattern in _LISTING_DATES:
+        match = pattern.search(text)
+        if not match:
+            continue
+        month = match.group("month")
+        month = int(month) if month.isdigit() else _MONTHS.get(month.lower())
+        if month is None:
+            continue
+        modified = calendar.timegm((
+            int(match.group("year")), month, int(match.group("day")),
+            int(match.group("hour")), int(match.group("minute")), int(match.groupdict().get("second") or 0)
+        ))
+        text = text[:match.start()] + text[match.end():]
+        break
+    size = None
+    match = _LISTING_SIZE.search(text)
+    if match:
+        size = int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+    return modified, size
+
+
+class _DirectoryListingParser:
+    """Parses the file links of an HTML directory listing as chunks of it arrive.
+
+    The page is split at the start of each link, and each link is parsed together with the text that
+    follows it, which holds the size and date columns in nginx and Apache style listings. Only the
+    text after the last complete link is kept between chunks.
+    """
+
+    def __init__(self, base_url, file_ext=None):
+        self.base_url = base_url
+        self.file_ext = file_ext
+        self._base_directory = base_url.split("?", 1)[0].split("#", 1)[0].rsplit("/", 1)[0] + "/"
+        self._buffer = ""
+        self._seen = set()
+
+    def feed(self, text):
+        """Parse the next chunk of the page.
+
+        Returns:
+            list: The entries completed by this chunk.
+        """
+        self._buffer += text
+        starts = [match.start() for match in _LISTING_ANCHOR_START.finditer(self._buffer)]
+        if len(starts) < 2:
+            return []
+        entries = self._parse_segments(self._buffer[start:end] for start, end in zip(starts, starts[1:]))
+        self._buffer = self._buffer[starts[-1]:]
+        return entries
+
+    def close(self):
+        """Parse the rest of the page.
+
+        Returns:
+            list: The remaining entries.
+        """
+        match = _LISTING_ANCHOR_START.search(self._buffer)
+        entries = self._parse_segments([self._buffer[match.start():]]) if match else []
+        self._buffer = ""
+        return entries
+
+    def _parse_segments(self, segments):
+        entries = []
+        for segment in segments:
+            entry = self._parse_segment(segment)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def _parse_segment(self, segment):
+        match = _LISTING_HREF.match(segment)
+        if not match:
+            return None
+        href = html.unescape(next(group for group in match.groups() if group is not None)).replace('"', '').strip("\\")
+        if self.file_ext is not None and not href.endswith(self.file_ext):
+            return None
+        if _LISTING_PLAIN_HREF.match(href):
+            # most links are plain file names, which do not need a full URL join
+            file_url = self._base_directory + href
+        else:
+            file_url = _resolve_listing_url(self.base_url, href)
+        if file_url is None or file_url in self._seen:
+            return None
+        self._seen.add(file_url)
+        link_end = segment.lower().find("</a>")
+        columns = html.unescape(_LISTING_TAG.sub(" ", segment[link_end + 4:])) if link_end != -1 else ""
+        modified, size = _parse_listing_columns(columns)
+        return {"url": file_url, "size": size, "modified": modified}
+
+
+def _resolve_listing_url(base_url, href):
+    result = urlparse(href)
+    if all([result.scheme, result.netloc]):
+        return href
+    file_url = urljoin(base_url, href)
+    result = urlparse(file_url)
+    if not all([result.scheme, result.netloc]):
+        return None
+    return file_url
+
+
+def get_all_files_from_page(url, file_ext=None, parser="streaming", chunk_size=1024*64, **kwargs):
     """Get all file links from a page.
 
     Args:
         url (str): The URL to get the files from.
         file_ext (str, optional): The file extension to filter by. Defaults to None.
+        parser (str, optional): "streaming" to parse the links as the page downloads, which also reads the size
+            and date columns of directory listings, or "bs4" to parse the whole page with BeautifulSoup. Defaults to "streaming".
+        chunk_size (int, optional): The number of bytes to read at a time when streaming.
 
     Returns:
-        dict: A dictionary with fields: status (bool) and message (str) and files (list(dict of fields: url(str), filename(str)))
+        dict: A dictionary with fields: status (bool), message (str), files (list of URLs) and
+            entries (list of dicts with fields: url (str), size (int or None), modified (UTC timestamp or None))
     """
-    logger.debug("Getting all files from %s with extension: %s", url, file_ext)
-    response = get(url, **kwargs)
+    logger.debug("Getting all files from %s with extension: %s using the %s parser", url, file_ext, parser)
+    if parser not in ("streaming", "bs4"):
+        raise ValueError(f"Unknown parser: {parser}")
+    response = get(url, stream=parser == "streaming", **kwargs)
     if not response["status"]:
         return response
     response = response["response"]
-    files = []
-    soup = BeautifulSoup(response.text, 'html.parser')
-    links = soup.find_all('a')
-    for link in links:
-        href = link.get('href').replace('"', '').strip("\\")
-        if (file_ext is None) or (href.endswith(file_ext) and href not in files):
-            result = urlparse(href)
-            if all([result.scheme, result.netloc]):
-                file_url = href
-            else:
-                file_url = urljoin(url, href)
-                result = urlparse(file_url)
-                if not all([result.scheme, result.netloc]):
-                    continue
-            files.append(file_url)
-    logger.debug("%s Files retrieved", len(files))
-    return {"status": True, "message": "Files retrieved successfully", "files": files}
-
-
-def download_file_with_progress(download_url, download_path, progress_handler, chunk_size=1024*256, **kwargs):
+
+    if parser == "streaming":
+        # links are resolved against the requested URL rather than response.url, which is percent-encoded,
+        # so that callers can strip the URL they passed in from the results
+        listing_parser = _DirectoryListingParser(url, file_ext)
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        entries = []
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                entries.extend(listing_parser.feed(decoder.decode(chunk)))
+            entries.extend(listing_parser.feed(decoder.decode(b"", final=True)))
+        except RequestException as error:
+            logger.error("Error reading %s: %s", url, error)
+            return {"status": False, "message": error}
+        finally:
+            response.close()
+        entries.extend(listing_parser.close())
+    else:
+        entries = []
+        seen = set()
+        soup = BeautifulSoup(response.text, 'html.parser')
+        for link in soup.find_all('a'):
+            href = link.get('href', '').replace('"', '').strip("\\")
+            if file_ext is not None and not href.endswith(file_ext):
+                continue
+            file_url = _resolve_listing_url(url, href)
+            if file_url is None or file_url in seen:
+                continue
+            seen.add(file_url)
+            entries.append({"url": file_url, "size": None, "modified": None})
+
+    logger.debug("%s Files retrieved", len(entries))
+    return {"status": True, "message": "Files retrieved successfully", "files": [entry["url"] for entry in entries], "entries": entries}
+
+
+def download_file_with_progress(download_url, download_path, progress_handler, chunk_size=1024*256, resumable=False, expected_digest=None, expected_size=None, **kwargs):
     """Download a file from the given URL using a stream with a progress handler.
 
     Args:
@@ -99,44 +534,423 @@ def download_file_with_progress(download_url, download_path, progress_handler, c
         progress_handler (ProgressHandler): Progress handler to update the download progress.
         headers (dict): Headers to include in the request.
         chunk_size (int): The size of the chunks to download.
+        resumable (bool, optional): Download into a .part file that is kept on errors and cancellation
+            so that the next call for the same URL and path continues where it left off. Defaults to False.
+        expected_digest (str, optional): The expected digest of the file as "<algorithm>:<hex>", e.g. the
+            digest field of a GitHub release asset. It is computed over the chunks as they are written.
+        expected_size (int, optional): The expected size of the file in bytes.
 
     Returns:
         dict: A dictionary with fields: status (bool), message (str) and download_path (str)
     """
     if not isinstance(download_path, Path):
         raise TypeError("download_path must be a pathlib.Path object")
+    if resumable:
+        return download_file_resumable(download_url, download_path, progress_handler, chunk_size, expected_digest=expected_digest, expected_size=expected_size, **kwargs)
     logger.debug("Downloading file from %s to %s with chunk size: %s", download_url, download_path, chunk_size)
     response = get(download_url, stream=True, **kwargs)
     if not response["status"]:
         return response
     response = response["response"]
-    return download_through_stream(response, download_path, chunk_size, progress_handler)
+    return download_through_stream(response, download_path, chunk_size, progress_handler, expected_digest=expected_digest, expected_size=expected_size)
+
+
+def _get_partial_download_paths(download_path):
+    part_path = download_path.with_name(download_path.name + ".part")
+    return part_path, part_path.with_name(part_path.name + ".json")
+
+
+def _read_partial_download_state(state_path, download_url):
+    """Read the sidecar of a partial download.
+
+    Returns:
+        dict: The stored state, or None if there is no usable state for the given URL.
+    """
+    try:
+        with open(state_path, "r", encoding="utf-8") as file:
+            state = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(state, dict) or state.get("url") != download_url:
+        return None
+    if not (state.get("etag") or state.get("last_modified")):
+        return None
+    return state
+
+
+def _get_validators(response_headers):
+    etag = response_headers.get("ETag")
+    if etag and etag.startswith("W/"):
+        # weak validators cannot be used with If-Range
+        etag = None
+    return etag, response_headers.get("Last-Modified")
+
+
+def _write_partial_download_state(state_path, download_url, response_headers, total_size, segments=None):
+    etag, last_modified = _get_validators(response_headers)
+    state = {
+        "url": download_url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "size": total_size,
+    }
+    if segments is not None:
+        state["segments"] = segments
+    if not (state["etag"] or state["last_modified"]):
+        state_path.unlink(missing_ok=True)
+        return
+    with open(state_path, "w", encoding="utf-8") as file:
+        json.dump(state, file)
+
+
+def _finish_partial_download(part_path, state_path, download_path):
+    part_path.replace(download_path)
+    state_path.unlink(missing_ok=True)
+    return {
+        "status": True,
+        "message": "Download successful",
+        "download_path": Path(download_path)
+    }
+
+
+def _verify_and_finish_partial_download(part_path, state_path, download_path, progress_handler, expected_digest, expected_size):
+    hasher = _create_hasher(expected_digest)
+    try:
+        if hasher is not None:
+            _hash_file(part_path, hasher)
+        integrity_error = _check_download_integrity(hasher, expected_digest, part_path.stat().st_size, expected_size)
+        if integrity_error is not None:
+            logger.error("Integrity check failed for %s: %s", part_path, integrity_error)
+            part_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            progress_handler.report_error(integrity_error)
+            return {
+                "status": False,
+                "message": f"The downloaded file is corrupted or incomplete:\n\n{integrity_error}",
+                "download_path": None
+            }
+        progress_handler.report_success()
+        return _finish_partial_download(part_path, state_path, download_path)
+    except OSError as error:
+        logger.error("Unable to finish download of %s: %s", download_path, error)
+        progress_handler.report_error(error)
+        return {"status": False, "message": error, "download_path": None}
+
+
+def download_file_resumable(download_url, download_path, progress_handler, chunk_size=1024*256, expected_digest=None, expected_size=None, **kwargs):
+    """Download a file from the given URL, resuming a previous partial download if possible.
+
+    The file is written to ``<download_path>.part`` and a ``.part.json`` sidecar stores the ETag and
+    Last-Modified validators of the response. If both exist on the next call, the download is continued
+    with a Range request guarded by If-Range. If the server ignores the range, the file changed or the
+    range is not satisfiable, the download is restarted from the beginning. Other errors leave the
+    partial download in place so that it can be resumed later.
+
+    Args:
+        download_url (str): URL to download the file from.
+        download_path (pathlib.Path): Path to save the downloaded file to.
+        progress_handler (ProgressHandler): Progress handler to update the download progress.
+        chunk_size (int): The size of the chunks to download.
+        expected_digest (str, optional): The expected digest of the file as "<algorithm>:<hex>".
+        expected_size (int, optional): The expected size of the file in bytes.
+
+    Returns:
+        dict: A dictionary with fields: status (bool), message (str) and download_path (str).
+            If the download was cancelled, the dict also has paused (bool) set to True.
+    """
+    part_path, state_path = _get_partial_download_paths(download_path)
+    headers = dict(kwargs.pop("headers", constants.Requests.DEFAULT_HEADERS.value))
+    resume_from = 0
+    state = _read_partial_download_state(state_path, download_url) if part_path.exists() else None
+    if state is not None:
+        resume_from = part_path.stat().st_size
+        if state.get("size") and resume_from == state["size"]:
+            logger.debug("Partial download %s is already complete", part_path)
+            return _verify_and_finish_partial_download(part_path, state_path, download_path, progress_handler, expected_digest, expected_size)
+        if resume_from:
+            headers["Range"] = f"bytes={resume_from}-"
+            headers["If-Range"] = state["etag"] or state["last_modified"]
+
+    logger.debug("Downloading file from %s to %s with chunk size: %s, resuming from byte %s", download_url, part_path, chunk_size, resume_from)
+    response = get(download_url, stream=True, headers=headers, **kwargs)
+    if not response["status"] and resume_from and _get_error_status_code(response["message"]) == 416:
+        # the stored size no longer matches the file on the server, so start over
+        logger.info("Failed to resume download of %s, restarting from the beginning", download_url)
+        headers.pop("Range", None)
+        headers.pop("If-Range", None)
+        resume_from = 0
+        response = get(download_url, stream=True, headers=headers, **kwargs)
+    if not response["status"]:
+        # the partial file and its state are kept, so the download can be resumed once the server is reachable again
+        return response
+    response = response["response"]
+
+    if resume_from and response.status_code != 206:
+        logger.info("Server did not honour the range request for %s, restarting from the beginning", download_url)
+        resume_from = 0
+    if not resume_from:
+        size = int(response.headers.get("content-length", 0))
+        try:
+            part_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_partial_download_state(state_path, download_url, response.headers, size or None)
+        except OSError as error:
+            logger.warning("Unable to store partial download state for %s: %s", download_url, error)
+
+    result = download_through_stream(
+        response, part_path, chunk_size, progress_handler, resume_from=resume_from, keep_partial=True,
+        expected_digest=expected_digest, expected_size=expected_size
+    )
+    if not result["status"]:
+        if not part_path.exists():
+            # the partial file was discarded because it failed verification
+            state_path.unlink(missing_ok=True)
+        return result
+    try:
+        return _finish_partial_download(part_path, state_path, download_path)
+    except OSError as error:
+        logger.error("Unable to move %s to %s: %s", part_path, download_path, error)
+        return {"status": False, "message": error, "download_path": None}
+
+
+def _get_error_status_code(error):
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else None
+
 
+class _RangeNotSatisfied(RequestException):
+    """Raised when a segment request is answered without partial content."""
 
-def download_through_stream(response, download_path, chunk_size, progress_handler):
+
+def _split_into_segments(size, connections):
+    segment_size = -(-size // connections)
+    return [[start, min(start + segment_size, size) - 1, 0] for start in range(0, size, segment_size)]
+
+
+def _download_segment(download_url, part_path, segment, headers, chunk_size, cancel_event, report_bytes, **kwargs):
+    start, end, done = segment
+    if start + done > end:
+        return
+    segment_headers = dict(headers)
+    segment_headers["Range"] = f"bytes={start + done}-{end}"
+    response = get(download_url, stream=True, headers=segment_headers, **kwargs)
+    if not response["status"]:
+        raise response["message"]
+    response = response["response"]
+    with response, open(part_path, "r+b") as f:
+        if response.status_code != 206:
+            raise _RangeNotSatisfied(f"Server answered a range request with status {response.status_code}")
+        f.seek(start + done)
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if cancel_event.is_set():
+                return
+            f.write(chunk)
+            segment[2] += len(chunk)
+            report_bytes(len(chunk))
+
+
+def download_file_segmented(download_url, download_path, progress_handler, connections=constants.Requests.DOWNLOAD_CONNECTIONS.value, chunk_size=1024*256, expected_digest=None, expected_size=None, **kwargs):
+    """Download a file over several connections at once, each fetching its own byte range.
+
+    The size of the file is determined with a HEAD request. The file is preallocated as
+    ``<download_path>.part`` and every segment writes into its own region of it. Segment progress
+    is stored in the ``.part.json`` sidecar when the download is cancelled or fails, so it is resumed
+    the next time. If the server does not support ranges or the file is small, this falls back to a
+    single resumable stream through download_file_with_progress.
+
+    As the segments arrive out of order, an expected digest is checked with a single read of the
+    finished file rather than while streaming.
+
+    Args:
+        download_url (str): URL to download the file from.
+        download_path (pathlib.Path): Path to save the downloaded file to.
+        progress_handler (ProgressHandler): Progress handler to update the download progress.
+        connections (int, optional): The number of connections to download with.
+        chunk_size (int): The size of the chunks to download.
+        expected_digest (str, optional): The expected digest of the file as "<algorithm>:<hex>".
+        expected_size (int, optional): The expected size of the file in bytes.
+
+    Returns:
+        dict: A dictionary with fields: status (bool), message (str) and download_path (str).
+            If the download was cancelled, the dict also has paused (bool) set to True.
+    """
+    if not isinstance(download_path, Path):
+        raise TypeError("download_path must be a pathlib.Path object")
     if progress_handler is None:
         progress_handler = ProgressHandler()
+    headers = dict(kwargs.pop("headers", constants.Requests.DEFAULT_HEADERS.value))
+
+    def fall_back():
+        return download_file_with_progress(
+            download_url, download_path, progress_handler, chunk_size, resumable=True,
+            expected_digest=expected_digest, expected_size=expected_size, headers=headers, **kwargs
+        )
+
+    probe = head(download_url, headers=headers, **kwargs)
+    if not probe["status"]:
+        return fall_back()
+    probe = probe["response"]
+    size = int(probe.headers.get("content-length", 0))
+    if connections < 2 or probe.headers.get("Accept-Ranges", "").lower() != "bytes" or size < constants.Requests.SEGMENTED_DOWNLOAD_MIN_SIZE.value:
+        return fall_back()
+
+    etag, last_modified = _get_validators(probe.headers)
+    if etag or last_modified:
+        headers["If-Range"] = etag or last_modified
+    part_path, state_path = _get_partial_download_paths(download_path)
+    state = _read_partial_download_state(state_path, download_url) if part_path.exists() else None
+    try:
+        if (state is not None and state.get("segments") and state.get("size") == size
+                and (state["etag"], state["last_modified"]) == (etag, last_modified)
+                and part_path.stat().st_size == size):
+            segments = state["segments"]
+        else:
+            segments = _split_into_segments(size, connections)
+            part_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+        state_path.unlink(missing_ok=True)
+    except OSError as error:
+        progress_handler.report_error(error)
+        return {
+            "status": False,
+            "message": f"Unable to create {part_path}:\n\n{error}",
+            "download_path": None
+        }
+
+    logger.debug("Downloading file from %s to %s in %s segments", download_url, part_path, len(segments))
     if not progress_handler.is_total_units_set():
-        size = int(response.headers.get('content-length', 0))
         progress_handler.set_total_units(size / 1024 / 1024)
+    progress_lock = threading.Lock()
+    cancel_event = threading.Event()
+    downloaded_bytes = sum(segment[2] for segment in segments)
+
+    def report_bytes(amount):
+        nonlocal downloaded_bytes
+        with progress_lock:
+            downloaded_bytes += amount
+            if progress_handler.should_cancel():
+                cancel_event.set()
+                return
+            progress_handler.report_progress(downloaded_bytes / 1024 / 1024)
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        futures = [
+            executor.submit(_download_segment, probe.url, part_path, segment, headers, chunk_size, cancel_event, report_bytes, **kwargs)
+            for segment in segments
+        ]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (RequestException, OSError) as error:
+                errors.append(error)
+                cancel_event.set()
+
+    if any(isinstance(error, _RangeNotSatisfied) for error in errors):
+        logger.info("Server did not honour range requests for %s, falling back to a single stream", download_url)
+        part_path.unlink(missing_ok=True)
+        return fall_back()
+    if errors or cancel_event.is_set():
+        try:
+            _write_partial_download_state(state_path, download_url, probe.headers, size, segments)
+        except OSError as error:
+            logger.warning("Unable to store partial download state for %s: %s", download_url, error)
+        if errors:
+            logger.error("Segmented download of %s failed: %s", download_url, errors[0])
+            progress_handler.report_error(errors[0])
+            return {
+                "status": False,
+                "message": errors[0],
+                "download_path": None
+            }
+        progress_handler.cancel()
+        return _paused_download_result()
+
+    return _verify_and_finish_partial_download(part_path, state_path, download_path, progress_handler, expected_digest, expected_size)
+
+
+def _create_hasher(expected_digest):
+    """Create a hash object for a digest in the form "<algorithm>:<hex>", as used by GitHub release assets.
+
+    A digest without an algorithm prefix is assumed to be sha256.
+
+    Returns:
+        hashlib object: The hash object, or None if no digest is given or the algorithm is unsupported.
+    """
+    if not expected_digest:
+        return None
+    algorithm = expected_digest.rpartition(":")[0] or "sha256"
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        logger.warning("Unsupported digest algorithm %s, skipping verification", algorithm)
+        return None
+
+
+def _hash_file(path, hasher, chunk_size=1024*1024):
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            hasher.update(chunk)
+
+
+def _check_download_integrity(hasher, expected_digest, downloaded_bytes, expected_size):
+    """Compare a finished download against the expected size and digest.
+
+    Returns:
+        str: A description of the mismatch, or None if the download matches.
+    """
+    if expected_size is not None and downloaded_bytes != expected_size:
+        return f"Expected {expected_size} bytes but received {downloaded_bytes} bytes"
+    if hasher is not None:
+        expected = expected_digest.rpartition(":")[2].lower()
+        if hasher.hexdigest() != expected:
+            return f"Expected {hasher.name} digest {expected} but got {hasher.hexdigest()}"
+    return None
+
+
+def _paused_download_result():
+    return {
+        "status": False,
+        "message": "Download cancelled. The progress has been kept and the download will resume next time.",
+        "download_path": None,
+        "paused": True
+    }
+
+
+def download_through_stream(response, download_path, chunk_size, progress_handler, resume_from=0, keep_partial=False, expected_digest=None, expected_size=None):
+    if progress_handler is None:
+        progress_handler = ProgressHandler()
+    if not progress_handler.is_total_units_set():
+        size = int(response.headers.get('content-length', 0))
+        progress_handler.set_total_units((size + resume_from) / 1024 / 1024)
     rollback_needed = False
+    integrity_error = None
+    hasher = _create_hasher(expected_digest)
     try:
-        with open(download_path, 'wb') as f:
-            downloaded_bytes = 0
+        if hasher is not None and resume_from:
+            _hash_file(download_path, hasher)
+        with open(download_path, 'ab' if resume_from else 'wb') as f:
+            downloaded_bytes = resume_from
 
             for chunk in response.iter_content(chunk_size=chunk_size):
                 if progress_handler.should_cancel():
                     rollback_needed = True
                     break
                 f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
                 downloaded_bytes += len(chunk)
 
                 progress_handler.report_progress(downloaded_bytes / 1024 / 1024)
 
-            progress_handler.report_success()
+            if not rollback_needed:
+                integrity_error = _check_download_integrity(hasher, expected_digest, downloaded_bytes, expected_size)
+            if integrity_error is None:
+                progress_handler.report_success()
     except PermissionError as error:
         progress_handler.report_error(error)
-        download_path.unlink(missing_ok=True)
+        if not keep_partial:
+            download_path.unlink(missing_ok=True)
         return {
             "status": False,
             "message": f"Permission was denied. Make sure the app and the user have permission to write to the current directory:\n\n{download_path.parent}",
@@ -144,14 +958,28 @@ def download_through_stream(response, download_path, chunk_size, progress_handle
         }
     except (FileNotFoundError, RequestException, OSError) as error:
         progress_handler.report_error(error)
-        download_path.unlink(missing_ok=True)
+        if not keep_partial:
+            download_path.unlink(missing_ok=True)
         return {
             "status": False,
             "message": error,
             "download_path": None
         }
+    if integrity_error is not None:
+        logger.error("Integrity check failed for %s: %s", download_path, integrity_error)
+        progress_handler.report_error(integrity_error)
+        download_path.unlink(missing_ok=True)
+        return {
+            "status": False,
+            "message": f"The downloaded file is corrupted or incomplete:\n\n{integrity_error}",
+            "download_path": None
+        }
     if rollback_needed:
+        # release the connection back to the pool without reading the rest of the body
+        response.close()
         progress_handler.cancel()
+        if keep_partial:
+            return _paused_download_result()
         try:
             download_path.unlink(missing_ok=True)
         except PermissionError:
@@ -172,12 +1000,135 @@ def download_through_stream(response, download_path, chunk_size, progress_handle
     }
 
 
-def download_file(download_url, download_path, **kwargs):
+class RemoteFile(io.RawIOBase):
+    """
+    A read-only, seekable file object backed by HTTP range requests.
+
+    Sequential reads are served from one streamed response. Seeking to a different position
+    opens a new range request from there, unless the target is a short distance ahead, in which
+    case the gap is read and discarded. This lets zipfile and py7zr read an archive directly from
+    the server without downloading it to disk first.
+    """
+    SKIP_AHEAD_LIMIT = 1024 * 64
+
+    def __init__(self, url, size, headers=constants.Requests.DEFAULT_HEADERS.value, name=None, **kwargs):
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.name = name or unquote(urlparse(url).path.rsplit("/", 1)[-1])
+        self._headers = dict(headers)
+        self._kwargs = kwargs
+        self._position = 0
+        self._response = None
+        self._response_position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        match whence:
+            case io.SEEK_SET:
+                position = offset
+            case io.SEEK_CUR:
+                position = self._position + offset
+            case io.SEEK_END:
+                position = self.size + offset
+            case _:
+                raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        if self._position >= self.size:
+            return 0
+        if self._response is None or not 0 <= self._position - self._response_position <= self.SKIP_AHEAD_LIMIT:
+            self._open_response()
+        while self._response_position < self._position:
+            skipped = self._response.raw.read(self._position - self._response_position, decode_content=True)
+            if not skipped:
+                raise OSError(f"Connection to {self.url} closed unexpectedly")
+            self._response_position += len(skipped)
+
+        data = self._response.raw.read(min(len(buffer), self.size - self._position), decode_content=True)
+        if not data:
+            raise OSError(f"Connection to {self.url} closed unexpectedly")
+        buffer[:len(data)] = data
+        self._position += len(data)
+        self._response_position = self._position
+        return len(data)
+
+    def _open_response(self):
+        self._close_response()
+        headers = dict(self._headers)
+        headers["Range"] = f"bytes={self._position}-"
+        response = get(self.url, stream=True, headers=headers, **self._kwargs)
+        if not response["status"]:
+            raise OSError(f"Failed to read from {self.url}: {response['message']}")
+        response = response["response"]
+        if response.status_code != 206:
+            response.close()
+            raise OSError(f"Server did not honour the range request for {self.url}")
+        self._response = response
+        self._response_position = self._position
+
+    def _close_response(self):
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def close(self):
+        self._close_response()
+        super().close()
+
+
+def open_remote_file(url, headers=constants.Requests.DEFAULT_HEADERS.value, buffer_size=1024*1024, expected_size=None, **kwargs):
+    """Open a file on a server that supports range requests for reading, without downloading it first.
+
+    Args:
+        url (str): URL of the file.
+        headers (dict, optional): Headers to include in the requests.
+        buffer_size (int, optional): The size of the read buffer. Defaults to 1 MiB.
+        expected_size (int, optional): The expected size of the file in bytes. The file is not opened if the server reports a different size.
+
+    Returns:
+        dict: A dictionary with fields: status (bool), message (str) and file (io.BufferedReader).
+            The caller is responsible for closing the file.
+    """
+    probe = head(url, headers=headers, **kwargs)
+    if not probe["status"]:
+        return probe
+    probe = probe["response"]
+    size = int(probe.headers.get("content-length", 0))
+    if not size or probe.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return {"status": False, "message": "The server does not support range requests"}
+    if expected_size is not None and size != expected_size:
+        logger.error("Expected %s bytes for %s but the server reported %s bytes", expected_size, url, size)
+        return {"status": False, "message": f"Expected {expected_size} bytes but the server reported {size} bytes"}
+    name = unquote(urlparse(url).path.rsplit("/", 1)[-1])
+    logger.debug("Opened %s (%s bytes) for streaming", url, size)
+    return {
+        "status": True,
+        "message": "Remote file opened",
+        "file": io.BufferedReader(RemoteFile(probe.url, size, headers=headers, name=name, **kwargs), buffer_size=buffer_size)
+    }
+
+
+def download_file(download_url, download_path, expected_digest=None, expected_size=None, **kwargs):
     """Download a file from the given URL to the given path.
 
     Args:
         download_url (str): URL to download the file from.
         download_path (str): Path to save the downloaded file to.
+        expected_digest (str, optional): The expected digest of the file as "<algorithm>:<hex>".
+        expected_size (int, optional): The expected size of the file in bytes.
 
     Returns:
         dict: A dictionary with fields: status (bool), message (str) and download_path (str)
@@ -194,6 +1145,14 @@ def download_file(download_url, download_path, **kwargs):
         logger.error("Error downloading file: %s", error)
         return {"status": False, "message": error, "download_path": None}
 
+    hasher = _create_hasher(expected_digest)
+    if hasher is not None:
+        hasher.update(content)
+    integrity_error = _check_download_integrity(hasher, expected_digest, len(content), expected_size)
+    if integrity_error is not None:
+        logger.error("Integrity check failed for %s: %s", download_url, integrity_error)
+        return {"status": False, "message": f"The downloaded file is corrupted or incomplete:\n\n{integrity_error}", "download_path": None}
+
     download_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
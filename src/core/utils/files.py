@@ -1,8 +1,54 @@
+import contextlib
+import io
+import os
 import shutil
+import threading
 import zipfile
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
 
 from core.utils.progress_handler import ProgressHandler
 
+# The number of bytes each extraction worker reads from the archive at a time
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+
+
+class OperationCancelled(Exception):
+    """Raised by CancellableReader once the operation reading from it has been cancelled."""
+
+
+class CancellableReader(io.RawIOBase):
+    """
+    A read-only file object that reads from another one and raises OperationCancelled once should_cancel
+    returns True. This lets libraries such as py7zr, which cannot be stopped part way through an extraction,
+    be cancelled while they read from a slow source such as a RemoteFile.
+    """
+
+    def __init__(self, file, should_cancel):
+        super().__init__()
+        self._file = file
+        self._should_cancel = should_cancel
+        self.name = getattr(file, "name", None)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return self._file.seekable()
+
+    def tell(self):
+        return self._file.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def readinto(self, buffer):
+        if self._should_cancel():
+            raise OperationCancelled
+        data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
 
 def copy_directory_with_progress(source_dir, target_dir, progress_handler=None, exclude=None, include=None):
     if progress_handler is None:
@@ -56,23 +102,163 @@ def copy_directory_with_progress(source_dir, target_dir, progress_handler=None,
     }
 
 
-def extract_zip_archive_with_progress(zip_path, extract_directory, progress_handler):
-    extracted_files = []
+def copy_file_object(source, target, stop_event=None, on_progress=None, chunk_size=EXTRACT_CHUNK_SIZE):
+    """
+    Copy one file object to another in chunks, so that large files are never held in memory at once.
+
+    Args:
+        source: The file object to read from.
+        target: The file object to write to.
+        stop_event (threading.Event, optional): Stop copying once this is set.
+        on_progress (callable, optional): Called with the number of bytes written after each chunk.
+        chunk_size (int, optional): The number of bytes to copy at a time.
+
+    Returns:
+        bool: True if the whole file was copied, False if it was stopped first.
+    """
+    while chunk := source.read(chunk_size):
+        if stop_event is not None and stop_event.is_set():
+            return False
+        target.write(chunk)
+        if on_progress is not None:
+            on_progress(len(chunk))
+    return True
+
+
+def wait_for_workers(futures, progress_handler, get_progress, stop_event):
+    """
+    Wait for worker threads on the calling thread, reporting their progress and checking for cancellation,
+    so that the progress handler is only used from one thread.
+
+    Args:
+        futures (list): The futures of the workers.
+        progress_handler (ProgressHandler): The progress handler to report progress to.
+        get_progress (callable): Returns the progress to report.
+        stop_event (threading.Event): Set once waiting stops, to tell any remaining workers to stop.
+
+    Returns:
+        bool: True if every worker finished, False if the operation was cancelled.
+
+    Raises:
+        Exception: The first exception raised by a worker.
+    """
+    try:
+        while True:
+            done, pending = wait(futures, timeout=0.1, return_when=FIRST_EXCEPTION)
+            progress_handler.report_progress(get_progress())
+            for future in done:
+                future.result()
+            if not pending:
+                return True
+            if progress_handler.should_cancel():
+                return False
+    finally:
+        stop_event.set()
+
+
+def _get_member_path(extract_directory, member):
+    """
+    Get the path a zip member is extracted to, sanitised in the same way as ZipFile.extract so that
+    members cannot be written outside of extract_directory.
+    """
+    arcname = member.filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [part for part in arcname.split(os.path.sep) if part not in ("", os.path.curdir, os.path.pardir)]
+    return Path(extract_directory, *parts)
+
+
+def _shard_members(members, shard_count):
+    """
+    Split members into shards of roughly equal compressed size, largest members first.
+    """
+    shards = [[] for _ in range(shard_count)]
+    shard_sizes = [0] * shard_count
+    for member in sorted(members, key=lambda member: member.compress_size, reverse=True):
+        index = shard_sizes.index(min(shard_sizes))
+        shards[index].append(member)
+        shard_sizes[index] += member.compress_size
+    return [shard for shard in shards if shard]
+
+
+def extract_zip_archive_with_progress(zip_path, extract_directory, progress_handler, workers=None):
+    """
+    Extract a zip archive, reporting progress in MiB of extracted data.
+
+    Members are split between worker threads by compressed size and each worker reads the archive
+    through its own ZipFile, so archives with many small files are not limited by the latency of
+    writing one file at a time. The directory tree is created before any files are written. Archives
+    given as file objects, such as a RemoteFile, are read by a single worker as they cannot be shared.
+    If the operation is cancelled, the extracted files and created directories are removed.
+
+    Args:
+        zip_path (str or pathlib.Path or file object): The archive to extract.
+        extract_directory (pathlib.Path): The directory to extract the archive to.
+        progress_handler (ProgressHandler): The progress handler to report progress to.
+        workers (int, optional): The number of worker threads. Defaults to the number of CPUs, up to 8.
+
+    Returns:
+        dict: A dictionary with the status, message and the names of the extracted members.
+    """
     if progress_handler is None:
         progress_handler = ProgressHandler()
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1)
+    if hasattr(zip_path, "read"):
+        workers = 1
+    extract_directory = Path(extract_directory)
+    extracted_files = []
+    created_directories = []
+    extracted_bytes = 0
+    progress_lock = threading.Lock()
+    stop_event = threading.Event()
+
+    def add_progress(size):
+        nonlocal extracted_bytes
+        with progress_lock:
+            extracted_bytes += size
+
+    def extract_shard(shard, archive=None):
+        with zipfile.ZipFile(zip_path, "r") if archive is None else contextlib.nullcontext(archive) as archive:
+            for member in shard:
+                if stop_event.is_set():
+                    return
+                target_path = _get_member_path(extract_directory, member)
+                with archive.open(member) as source, open(target_path, "wb") as target:
+                    with progress_lock:
+                        extracted_files.append(member)
+                    if not copy_file_object(source, target, stop_event, add_progress):
+                        return
+
     rollback_needed = False
     try:
-        with zipfile.ZipFile(zip_path, 'r') as archive:
-            total_files = len(archive.namelist())
-            progress_handler.set_total_units(total_files)
-            for file in archive.namelist():
-                if progress_handler.should_cancel():
-                    rollback_needed = True
-                    break
-                archive.extract(file, extract_directory)
-                extracted_files.append(file)
-                # Calculate and display progress
-                progress_handler.report_progress(len(extracted_files))
+        with zipfile.ZipFile(zip_path, "r") as archive:
+            members = archive.infolist()
+            progress_handler.set_total_units(sum(member.file_size for member in members) / 1024 / 1024)
+
+            # create every directory once up front instead of checking for it before each file
+            directories = {extract_directory}
+            for member in members:
+                member_path = _get_member_path(extract_directory, member)
+                directory = member_path if member.is_dir() else member_path.parent
+                while directory not in directories:
+                    directories.add(directory)
+                    directory = directory.parent
+            for directory in sorted(directories, key=lambda directory: len(directory.parts)):
+                if not directory.is_dir():
+                    directory.mkdir(parents=True, exist_ok=True)
+                    created_directories.append(directory)
+
+            # a later member with the same path replaces an earlier one, as with ZipFile.extract
+            files = list({_get_member_path(extract_directory, member): member for member in members if not member.is_dir()}.values())
+            if workers == 1:
+                shards = [files]
+            else:
+                shards = _shard_members(files, workers)
+            with ThreadPoolExecutor(max_workers=max(len(shards), 1), thread_name_prefix="extract") as executor:
+                futures = [executor.submit(extract_shard, shard, archive if workers == 1 else None) for shard in shards]
+                rollback_needed = not wait_for_workers(futures, progress_handler, lambda: extracted_bytes / 1024 / 1024, stop_event)
     except zipfile.BadZipFile as error:
         progress_handler.report_error(error)
         return {"status": False, "message": "The ZIP file is corrupted or invalid"}
@@ -82,19 +268,16 @@ def extract_zip_archive_with_progress(zip_path, extract_directory, progress_hand
 
     if rollback_needed:
         progress_handler.cancel()
-        dirs = []
-        for file in extracted_files:
-            file_path = extract_directory / file
-            if file_path.is_dir():
-                dirs.append(file_path)
-            if file_path.is_file():
-                file_path.unlink(missing_ok=True)
-        for dir in dirs:
+        for member in extracted_files:
+            _get_member_path(extract_directory, member).unlink(missing_ok=True)
+        for directory in reversed(created_directories):
             try:
-                dir.rmdir()
+                directory.rmdir()
             except OSError:
                 pass
-        zip_path.unlink(missing_ok=True)
+        if isinstance(zip_path, Path):
+            zip_path.unlink(missing_ok=True)
         return {"status": False, "message": "Extraction cancelled"}
+    progress_handler.report_progress(extracted_bytes / 1024 / 1024)
     progress_handler.report_success()
-    return {"status": True, "message": "Extraction successful", "extracted_files": extracted_files}
+    return {"status": True, "message": "Extraction successful", "extracted_files": [member.filename for member in members]}
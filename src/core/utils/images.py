@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from PIL import Image
+
+from core.logging.logger import Logger
+
+logger = Logger(__name__).get_logger()
+
+
+def create_thumbnail(image_path: Path, thumbnail_path: Path, size):
+    """
+    Decode an image and save a copy of it resized to the size it is displayed at,
+    so that it does not need to be decoded and resized at full size again.
+
+    Args:
+        image_path (pathlib.Path): The path of the image to resize.
+        thumbnail_path (pathlib.Path): The path to save the thumbnail to. The format is chosen from its extension.
+        size (tuple): The size in (x, y) to resize the image to.
+
+    Returns:
+        dict: A dictionary with the status, message and the path of the thumbnail.
+    """
+    try:
+        with Image.open(image_path) as image:
+            thumbnail = image.convert("RGB" if thumbnail_path.suffix.lower() in (".jpg", ".jpeg") else "RGBA")
+            thumbnail = thumbnail.resize(size, Image.Resampling.LANCZOS)
+            thumbnail.save(thumbnail_path, quality=90)
+    except (OSError, ValueError) as error:
+        logger.error("Failed to create thumbnail of %s: %s", image_path, error)
+        return {
+            "status": False,
+            "message": f"Failed to create thumbnail: {error}",
+        }
+    return {
+        "status": True,
+        "message": "Thumbnail created successfully",
+        "thumbnail_path": thumbnail_path,
+    }
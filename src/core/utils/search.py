@@ -0,0 +1,194 @@
+import bisect
+import itertools
+import re
+import unicodedata
+from array import array
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalise_text(text):
+    """
+    Normalise text for searching by removing accents, case and repeated whitespace.
+
+    Args:
+        text (str): The text to normalise.
+
+    Returns:
+        str: The normalised text.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_accents = "".join(character for character in decomposed if not unicodedata.combining(character))
+    return " ".join(without_accents.casefold().split())
+
+
+class SearchIndex:
+    """
+    A substring search index over a list of items, built once so that searches do not need to scan every item.
+
+    Each item's text is normalised once and split into n-grams. A query is answered by intersecting the
+    postings of its n-grams and then checking the remaining candidates. When a query extends the previous
+    one, only the previous matches are checked, which keeps search-as-you-type fast on large lists.
+    """
+    NGRAM_SIZE = 3
+
+    def __init__(self, items, key=None):
+        """
+        Args:
+            items (list): The items to index.
+            key (callable, optional): A function returning the text to search for an item. Defaults to the item itself.
+        """
+        self.items = list(items)
+        self._texts = [normalise_text(key(item) if key else item) for item in self.items]
+        self._postings = {}
+        for index, text in enumerate(self._texts):
+            for ngram in {text[start:start + self.NGRAM_SIZE] for start in range(len(text) - self.NGRAM_SIZE + 1)}:
+                postings = self._postings.get(ngram)
+                if postings is None:
+                    postings = self._postings[ngram] = array("I")
+                postings.append(index)
+        self._last_query = None
+        self._last_matches = None
+
+    def search(self, query):
+        """
+        Get the items whose text contains the query, ignoring case and accents.
+
+        Args:
+            query (str): The text to search for.
+
+        Returns:
+            list: The matching items in their original order.
+        """
+        query = normalise_text(query)
+        if not query:
+            return list(self.items)
+
+        if self._last_query is not None and self._last_query in query:
+            # every item containing the new query also contains the previous one
+            candidates = self._last_matches
+        elif len(query) >= self.NGRAM_SIZE:
+            candidates = self._get_ngram_candidates(query)
+        else:
+            candidates = range(len(self._texts))
+
+        matches = [index for index in candidates if query in self._texts[index]]
+        self._last_query = query
+        self._last_matches = matches
+        return [self.items[index] for index in matches]
+
+    def _get_ngram_candidates(self, query):
+        ngrams = {query[start:start + self.NGRAM_SIZE] for start in range(len(query) - self.NGRAM_SIZE + 1)}
+        postings = sorted((self._postings.get(ngram, ()) for ngram in ngrams), key=len)
+        candidates = set(postings[0])
+        for other_postings in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(other_postings)
+        return sorted(candidates)
+
+
+def tokenise_text(text):
+    """
+    Split normalised text into words, ignoring punctuation.
+
+    Args:
+        text (str): The normalised text.
+
+    Returns:
+        list: The words in the text.
+    """
+    return _WORD_PATTERN.findall(text)
+
+
+def _get_deletes(token):
+    return {token[:position] + token[position + 1:] for position in range(len(token))}
+
+
+class RankedSearchIndex(SearchIndex):
+    """
+    A SearchIndex that can also rank items by how well their words match a query, tolerating typos and punctuation.
+
+    Every query word must match a word of the item exactly, as the start of a word, or within one edit for
+    words of at least MIN_FUZZY_WORD_LENGTH characters. Typos are found with precomputed deletion variants of
+    every indexed word, so no edit distances are calculated while searching. Items can also have structured
+    fields, such as the region of a game, which are computed once and used to filter results.
+    """
+    MIN_FUZZY_WORD_LENGTH = 4
+    EXACT_MATCH_SCORE = 3
+    PREFIX_MATCH_SCORE = 2
+    FUZZY_MATCH_SCORE = 1
+
+    def __init__(self, items, key=None, fields=None):
+        """
+        Args:
+            items (list): The items to index.
+            key (callable, optional): A function returning the text to search for an item. Defaults to the item itself.
+            fields (callable, optional): A function returning a dictionary of structured fields for an item.
+        """
+        super().__init__(items, key)
+        self.fields = [fields(item) for item in self.items] if fields else [{} for _ in self.items]
+        self._word_postings = {}
+        for index, text in enumerate(self._texts):
+            for word in set(tokenise_text(text)):
+                postings = self._word_postings.get(word)
+                if postings is None:
+                    postings = self._word_postings[word] = array("I")
+                postings.append(index)
+        self._words = sorted(self._word_postings)
+        # maps each word and each variant of a word with one character deleted to the words it came from
+        self._word_variants = {}
+        for word in self._words:
+            if len(word) < self.MIN_FUZZY_WORD_LENGTH:
+                continue
+            for variant in _get_deletes(word) | {word}:
+                self._word_variants.setdefault(variant, []).append(word)
+
+    def _match_word(self, word):
+        """
+        Get the indexed words that match a query word and the score of each match.
+        """
+        matches = {}
+        if len(word) >= self.MIN_FUZZY_WORD_LENGTH:
+            for variant in _get_deletes(word) | {word}:
+                for candidate in self._word_variants.get(variant, ()):
+                    matches[candidate] = self.FUZZY_MATCH_SCORE
+        start = bisect.bisect_left(self._words, word)
+        for candidate in itertools.takewhile(lambda candidate: candidate.startswith(word), itertools.islice(self._words, start, None)):
+            matches[candidate] = self.PREFIX_MATCH_SCORE
+        if word in self._word_postings:
+            matches[word] = self.EXACT_MATCH_SCORE
+        return matches
+
+    def ranked_search(self, query, filter_function=None):
+        """
+        Get the items matching every word of the query, best matches first.
+
+        Args:
+            query (str): The words to search for. If empty, all items that pass the filter are returned.
+            filter_function (callable, optional): Called with the fields of an item, returning whether to include it.
+
+        Returns:
+            list: The matching items, ordered by score, then by length, then by their original order.
+        """
+        words = tokenise_text(normalise_text(query))
+        if not words:
+            return [item for item, fields in zip(self.items, self.fields) if filter_function is None or filter_function(fields)]
+
+        scores = None
+        for word in words:
+            word_scores = {}
+            for matched_word, score in self._match_word(word).items():
+                for index in self._word_postings[matched_word]:
+                    if word_scores.get(index, 0) < score:
+                        word_scores[index] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {index: score + word_scores[index] for index, score in scores.items() if index in word_scores}
+            if not scores:
+                return []
+
+        matches = [index for index in scores if filter_function is None or filter_function(self.fields[index])]
+        matches.sort(key=lambda index: (-scores[index], len(self._texts[index]), index))
+        return [self.items[index] for index in matches]
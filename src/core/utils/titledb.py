@@ -0,0 +1,266 @@
+import codecs
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from requests import RequestException
+
+from core.logging.logger import Logger
+from core.network.web import get
+from core.utils.progress_handler import ProgressHandler
+
+logger = Logger(__name__).get_logger()
+
+
+class TitleDB:
+    """
+    A read-only, indexed view of the Switch TitleDB stored in SQLite.
+
+    The TitleDB JSON is converted once with download_titledb_database and titles are then
+    looked up by ID without loading the whole database into memory.
+    """
+    # The fields of each title that are used by the UI
+    FIELDS = ("name", "description", "iconUrl")
+
+    def __init__(self, database_path: Path):
+        self.database_path = database_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(f"file:{database_path.as_posix()}?mode=ro", uri=True, check_same_thread=False)
+
+    def get(self, title_id):
+        """
+        Get the metadata of a title.
+
+        Args:
+            title_id (str): The title ID to look up.
+
+        Returns:
+            dict: A dictionary with the name, description and iconUrl of the title, or None if it was not found.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT name, description, icon_url FROM titles WHERE title_id = ?", (str(title_id), )
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(self.FIELDS, row))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def create_titledb_database(titles, database_path: Path):
+    """
+    Write titles to a new TitleDB database, replacing any existing database at database_path.
+
+    The titles are consumed lazily, so a generator can produce them while they are being downloaded.
+    Exceptions raised by the iterable are propagated.
+
+    Args:
+        titles: An iterable of (title_id, title) pairs, where title is a dictionary containing the fields in TitleDB.FIELDS.
+        database_path (pathlib.Path): The path to write the database to.
+
+    Returns:
+        dict: A dictionary with the status, message, the database path and the number of titles written.
+    """
+    temp_path = database_path.with_name(database_path.name + ".tmp")
+    temp_path.unlink(missing_ok=True)
+    count = 0
+
+    def rows():
+        nonlocal count
+        for title_id, title in titles:
+            if not isinstance(title, dict):
+                continue
+            count += 1
+            yield (str(title_id), *(title.get(field) for field in TitleDB.FIELDS))
+
+    try:
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.execute(
+                "CREATE TABLE titles (title_id TEXT PRIMARY KEY, name TEXT, description TEXT, icon_url TEXT) WITHOUT ROWID"
+            )
+            connection.executemany("INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?)", rows())
+            connection.commit()
+        finally:
+            connection.close()
+        temp_path.replace(database_path)
+    except (sqlite3.Error, OSError) as error:
+        logger.error("Failed to create TitleDB database at %s: %s", database_path, error)
+        return {
+            "status": False,
+            "message": f"Failed to create the TitleDB database: {error}",
+        }
+    finally:
+        # errors raised by the titles iterable are left to the caller, but the partial database is always removed
+        temp_path.unlink(missing_ok=True)
+    logger.info("Created TitleDB database with %s titles at %s", count, database_path)
+    return {
+        "status": True,
+        "message": "TitleDB database created successfully",
+        "database_path": database_path,
+        "titles": count,
+    }
+
+
+class TitleDBParser:
+    """
+    An incremental parser for the TitleDB JSON, which is a single object mapping title IDs to titles.
+
+    Chunks of the document are passed to feed as they arrive and each complete title is returned
+    as soon as it has been read, with only the fields in TitleDB.FIELDS kept. Only the unparsed
+    remainder of the document is buffered, so memory use stays around the size of one title.
+    """
+    # Give up if a single title is larger than this, as the document is most likely not a TitleDB
+    MAX_RECORD_SIZE = 16 * 1024 * 1024
+    _SEPARATORS = re.compile(r"[\s,]*")
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        # the buffered length to wait for before retrying an incomplete title, so that small
+        # chunks do not cause a large title to be parsed again for every chunk
+        self._retry_length = 0
+        self.finished = False
+        self.bytes_parsed = 0
+
+    def feed(self, data: bytes, final=False):
+        """
+        Parse the next chunk of the document.
+
+        Args:
+            data (bytes): The next chunk of the document.
+            final (bool): Whether this is the last chunk. If it is, the document must be complete.
+
+        Returns:
+            list: The (title_id, title) pairs that were completed by this chunk.
+
+        Raises:
+            ValueError: If the document is not a valid TitleDB.
+        """
+        self.bytes_parsed += len(data)
+        buffer = self._buffer + self._text_decoder.decode(data, final)
+        position = self._SEPARATORS.match(buffer).end()
+        if not self._started and position < len(buffer):
+            if buffer[position] != "{":
+                raise ValueError("The TitleDB is not a JSON object")
+            self._started = True
+            position += 1
+
+        titles = []
+        if len(buffer) - position < self._retry_length and not final:
+            self._buffer = buffer[position:]
+            return titles
+        while self._started and not self.finished:
+            position = self._SEPARATORS.match(buffer, position).end()
+            if position >= len(buffer):
+                break
+            if buffer[position] == "}":
+                self.finished = True
+                position += 1
+                break
+            try:
+                title_id, end = self._decoder.raw_decode(buffer, position)
+                end = self._SEPARATORS.match(buffer, end).end()
+                if end < len(buffer) and buffer[end] != ":":
+                    raise ValueError(f"Expected ':' after title ID {title_id}")
+                end = self._SEPARATORS.match(buffer, end + 1).end()
+                title, end = self._decoder.raw_decode(buffer, end)
+            except json.JSONDecodeError:
+                # the title is incomplete, wait for more of it to arrive
+                self._retry_length = 2 * (len(buffer) - position)
+                break
+            if end == len(buffer) and not final:
+                # a value at the end of the buffer, such as a number, may continue in the next chunk
+                break
+            if not isinstance(title_id, str):
+                raise ValueError(f"Invalid title ID: {title_id}")
+            if isinstance(title, dict):
+                titles.append((title_id, {field: title.get(field) for field in TitleDB.FIELDS}))
+            position = end
+            self._retry_length = 0
+
+        self._buffer = buffer[position:]
+        if final and not self.finished:
+            raise ValueError("The TitleDB ended unexpectedly")
+        if len(self._buffer) > self.MAX_RECORD_SIZE:
+            raise ValueError("The TitleDB contains an entry that is too large")
+        return titles
+
+
+class _IngestCancelled(Exception):
+    """Raised inside the title generator to stop ingestion when the user cancels."""
+
+
+def download_titledb_database(download_url, database_path: Path, progress_handler=None, chunk_size=1024 * 256):
+    """
+    Download the TitleDB and write it to a TitleDB database, parsing titles as they arrive
+    instead of saving and loading the whole JSON file.
+
+    Progress is reported as the number of titles parsed. The total is estimated from the
+    size of the download and the number of titles in the bytes received so far.
+
+    Args:
+        download_url (str): The URL of the TitleDB JSON.
+        database_path (pathlib.Path): The path to write the database to.
+        progress_handler (ProgressHandler, optional): The progress handler to report progress to.
+        chunk_size (int, optional): The number of bytes to read at a time.
+
+    Returns:
+        dict: A dictionary with the status, message, the database path and the number of titles written.
+    """
+    if progress_handler is None:
+        progress_handler = ProgressHandler()
+    response = get(download_url, stream=True)
+    if not response["status"]:
+        progress_handler.report_error(response["message"])
+        return response
+    response = response["response"]
+    size = int(response.headers.get("content-length", 0))
+    parser = TitleDBParser()
+
+    def titles():
+        parsed = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if progress_handler.should_cancel():
+                raise _IngestCancelled
+            for title in parser.feed(chunk):
+                parsed += 1
+                yield title
+            if size and parsed:
+                progress_handler.set_total_units(max(parsed, round(parsed * size / parser.bytes_parsed)))
+            progress_handler.report_progress(parsed)
+        yield from parser.feed(b"", final=True)
+
+    try:
+        result = create_titledb_database(titles(), database_path)
+    except _IngestCancelled:
+        logger.info("TitleDB download cancelled")
+        progress_handler.cancel()
+        return {
+            "status": False,
+            "message": "Download cancelled",
+            "database_path": None,
+        }
+    except (RequestException, ValueError) as error:
+        logger.error("Failed to download TitleDB from %s: %s", download_url, error)
+        progress_handler.report_error(error)
+        return {
+            "status": False,
+            "message": f"Failed to download the TitleDB: {error}",
+        }
+    finally:
+        response.close()
+    if not result["status"]:
+        progress_handler.report_error(result["message"])
+        return result
+    progress_handler.set_total_units(result["titles"])
+    progress_handler.report_progress(result["titles"])
+    progress_handler.report_success()
+    return result
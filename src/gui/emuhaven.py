@@ -279,4 +279,5 @@ class EmuHaven(customtkinter.CTk):
                 shutil.rmtree(temp_folder)
             except PermissionError:
                 pass
+        web.close_session()
         self.destroy()
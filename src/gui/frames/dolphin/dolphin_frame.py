@@ -138,7 +138,8 @@ class DolphinFrame(EmulatorFrame):
             self.launch_dolphin_handler,
             kwargs={"update_mode": update_mode},
             completion_functions=[lambda: self.configure_buttons(state="normal")],
-            error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Error", "An unexpected error occurred while launching Dolphin.\nPlease check the logs for more information and report this issue.")]
+            error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Error", "An unexpected error occurred while launching Dolphin.\nPlease check the logs for more information and report this issue.")],
+            event_class="process"
             )
 
     def launch_dolphin_handler(self, update_mode):
@@ -205,6 +206,7 @@ class DolphinFrame(EmulatorFrame):
     def install_dolphin_handler(self, archive_path=None, update_mode=False):
 
         custom_install = archive_path is not None
+        streamed = False
 
         if archive_path is None:
             release_fetch_result = self.dolphin.get_dolphin_release()
@@ -223,28 +225,41 @@ class DolphinFrame(EmulatorFrame):
                     }
                 self.configure_buttons(launch_dolphin_button_text="Updating...")
 
-            self.main_progress_frame.start_operation(title="Install Dolphin", total_units=0, units=" MiB", status="Downloading...")
-            download_result = self.dolphin.download_release(release_fetch_result["release"], progress_handler=self.main_progress_frame)
-            if not download_result["status"]:
-                if "cancelled" in download_result["message"]:
+            if self.settings.delete_files_after_installing:
+                # the archive would be deleted afterwards anyway, so extract it straight from the server
+                stream_result = self.dolphin.open_release_stream(release_fetch_result["release"])
+                streamed = stream_result["status"]
+                if streamed:
+                    archive_path = stream_result["file"]
+            if not streamed:
+                self.main_progress_frame.start_operation(title="Install Dolphin", total_units=0, units=" MiB", status="Downloading...")
+                download_result = self.dolphin.download_release(release_fetch_result["release"], progress_handler=self.main_progress_frame)
+                if not download_result["status"]:
+                    if "cancelled" in download_result["message"]:
+                        return {
+                            "message": {
+                                "function": messagebox.showinfo,
+                                "arguments": (self.winfo_toplevel(), "Dolphin", "The download was cancelled."),
+                            }
+                        }
                     return {
                         "message": {
-                            "function": messagebox.showinfo,
-                            "arguments": (self.winfo_toplevel(), "Dolphin", "The download was cancelled."),
+                            "function": messagebox.showerror,
+                            "arguments": (self.winfo_toplevel(), "Dolphin", f"Failed to download the latest release of Dolphin:\n\n{download_result['message']}"),
                         }
                     }
-                return {
-                    "message": {
-                        "function": messagebox.showerror,
-                        "arguments": (self.winfo_toplevel(), "Dolphin", f"Failed to download the latest release of Dolphin:\n\n{download_result['message']}"),
-                    }
-                }
-
-            archive_path = download_result["download_path"]
 
-        self.main_progress_frame.start_operation(title="Install Dolphin", total_units=1, units=" Files", status="Extracting...")
-        self.main_progress_frame.set_cancel_button_state(state="disabled")
-        extract_result = self.dolphin.extract_release(archive_path, progress_handler=self.main_progress_frame)
+                archive_path = download_result["download_path"]
+
+        self.main_progress_frame.start_operation(title="Install Dolphin", total_units=0, units=" MiB", status="Extracting...")
+        if not streamed:
+            # a streamed release is still being downloaded while it is extracted, so it can be cancelled
+            self.main_progress_frame.set_cancel_button_state(state="disabled")
+        try:
+            extract_result = self.dolphin.extract_release(archive_path, progress_handler=self.main_progress_frame)
+        finally:
+            if streamed:
+                archive_path.close()
         if not extract_result["status"]:
             if "cancelled" in extract_result["message"]:
                 return {
@@ -261,7 +276,7 @@ class DolphinFrame(EmulatorFrame):
             }
 
         self.metadata.set_version("dolphin", release_fetch_result["release"]["version"] if not custom_install else "")
-        if not custom_install and self.settings.delete_files_after_installing:
+        if not custom_install and not streamed and self.settings.delete_files_after_installing:
             archive_path.unlink()
         return {
             "message": {
@@ -333,6 +348,7 @@ class DolphinFrame(EmulatorFrame):
         self.configure_data_buttons(import_text="Importing...")
         self.event_manager.add_event(
             event_id="import_dolphin_data",
+            event_class="disk",
             func=self.import_data_handler,
             kwargs={"import_directory": directory, "folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -386,6 +402,7 @@ class DolphinFrame(EmulatorFrame):
 
         self.event_manager.add_event(
             event_id="export_dolphin_data",
+            event_class="disk",
             func=self.export_data_handler,
             kwargs={"export_directory": export_directory, "folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -431,6 +448,7 @@ class DolphinFrame(EmulatorFrame):
         self.configure_data_buttons(delete_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_dolphin_data",
+            event_class="disk",
             func=self.delete_data_handler,
             kwargs={"folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
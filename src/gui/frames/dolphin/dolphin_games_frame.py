@@ -4,7 +4,7 @@ import customtkinter
 
 from core.config import constants
 from core.network.myrient import get_game_download_url
-from core.network.web import download_file_with_progress
+from core.network.web import download_file_segmented
 from core.utils.files import extract_zip_archive_with_progress
 from gui.frames.my_games_frame import MyGamesFrame
 from gui.frames.myrient_game_list_frame import MyrientGameListFrame
@@ -69,11 +69,18 @@ class DolphinROMFrame(customtkinter.CTkTabview):
 
     def download_game(self, game, progress_handler, myrient_path):
         progress_handler.start_operation(title=game, total_units=0, units="MiB", status="Downloading...")
-        download_result = download_file_with_progress(
+        download_result = download_file_segmented(
             download_url=get_game_download_url(game, myrient_path=myrient_path),
             download_path=Path(self.settings.dolphin.game_directory) / f"{game}.zip",
             progress_handler=progress_handler
         )
+        if download_result.get("paused"):
+            return {
+                "message": {
+                    "function": messagebox.showinfo,
+                    "arguments": (self.winfo_toplevel(), "Game Download", "The download was paused. Download the game again to resume it."),
+                }
+            }
         if not download_result["status"]:
             return {
                 "message": {
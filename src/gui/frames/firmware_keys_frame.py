@@ -1,5 +1,7 @@
 import customtkinter
 
+from core.emulators.ryujinx.runner import Ryujinx
+from core.emulators.yuzu.runner import Yuzu
 from gui.handlers.thread_event_manager import ThreadEventManager
 from gui.libs.CTkMessagebox import messagebox
 from gui.libs.CTkScrollableDropdown import CTkScrollableDropdown
@@ -7,8 +9,12 @@ from gui.windows.path_dialog import PathDialog
 
 
 class FirmwareKeysFrame(customtkinter.CTkFrame):
+    # every Switch emulator has one of these frames, and installing firmware can update more than one emulator
+    frames = []
+
     def __init__(self, master, frame_obj, emulator_obj):
         super().__init__(master)
+        FirmwareKeysFrame.frames.append(self)
         self.frame_obj = frame_obj
         self.event_manager = frame_obj.event_manager
         self.event_manager = ThreadEventManager(self)
@@ -84,16 +90,31 @@ class FirmwareKeysFrame(customtkinter.CTkFrame):
             release = self.firmware_key_dict["firmware"][self.firmware_option_menu_variable.get()]
             kwargs = {"firmware_release": release}
 
+        # the firmware only needs to be decompressed once to install it for every Switch emulator that is set up
+        other_emulators = self.get_other_switch_emulators()
+        if other_emulators and messagebox.askyesno(self.winfo_toplevel(), "Firmware Installation", f"Also install this firmware for {", ".join(emulator.emulator.capitalize() for emulator in other_emulators)}?") == "yes":
+            kwargs["emulators"] = [self.emulator_obj] + other_emulators
+
         self.frame_obj.configure_buttons(install_firmware_button_text="Installing...")
         self.event_manager.add_event(
             event_id="install_firmware",
             func=self.install_firmware_handler,
             kwargs=kwargs,
-            completion_functions=[lambda: self.frame_obj.configure_buttons(state="normal")],
+            completion_functions=[lambda: self.frame_obj.configure_buttons(state="normal"), self.update_all_installed_versions],
             error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Firmware Installation", "An unexpected error occured while installing the firmware. Check the logs for more details and report this issue.")]
         )
 
-    def install_firmware_handler(self, firmware_archive=None, firmware_release=None):
+    def get_other_switch_emulators(self):
+        emulators = []
+        for emulator_class in (Yuzu, Ryujinx):
+            if isinstance(self.emulator_obj, emulator_class):
+                continue
+            emulator = emulator_class(self.settings, self.versions)
+            if emulator.has_user_directory():
+                emulators.append(emulator)
+        return emulators
+
+    def install_firmware_handler(self, firmware_archive=None, firmware_release=None, emulators=None):
 
         custom_archive = firmware_archive is not None
 
@@ -123,8 +144,8 @@ class FirmwareKeysFrame(customtkinter.CTkFrame):
                     "arguments": (self.winfo_toplevel(), "Firmware Installation", "The firmware archive is invalid or corrupt"),
                 }
             }
-        self.frame_obj.main_progress_frame.start_operation("Install Firmware", total_units=0, units=" Files", status="Extracting...")
-        install_result = self.emulator_obj.install_firmware_from_archive(firmware_archive, progress_handler=self.frame_obj.main_progress_frame)
+        self.frame_obj.main_progress_frame.start_operation("Install Firmware", total_units=0, units=" MiB", status="Extracting...")
+        install_result = self.emulator_obj.install_firmware_from_archive(firmware_archive, progress_handler=self.frame_obj.main_progress_frame, emulators=emulators)
         if not install_result["status"]:
             if "cancelled" in install_result["message"]:
                 return {
@@ -142,7 +163,8 @@ class FirmwareKeysFrame(customtkinter.CTkFrame):
 
         if not custom_archive and self.settings.delete_files_after_installing:
             firmware_archive.unlink()
-        self.versions.set_version(f"{self.emulator_obj.emulator}_firmware", firmware_release["version"].replace("v", "") if not custom_archive else "Unknown")
+        for emulator in emulators or [self.emulator_obj]:
+            self.versions.set_version(f"{emulator.emulator}_firmware", firmware_release["version"].replace("v", "") if not custom_archive else "Unknown")
         return {
             "message": {
                 "function": messagebox.showsuccess,
@@ -301,6 +323,11 @@ class FirmwareKeysFrame(customtkinter.CTkFrame):
             "result": (firmware_keys_fetch_result["firmware_keys"], ),
         }
 
+    @classmethod
+    def update_all_installed_versions(cls):
+        for frame in cls.frames:
+            frame.update_installed_versions()
+
     def update_installed_versions(self):
         self.installed_firmware_version_label.configure(text=self.emulator_obj.get_installed_firmware_version() or "Not Installed")
         self.installed_key_version_label.configure(text=self.emulator_obj.get_installed_key_version() or "Not Installed")
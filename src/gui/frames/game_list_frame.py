@@ -2,11 +2,18 @@ import customtkinter
 
 from core.config import constants
 from core.logging.logger import Logger
+from core.utils.search import SearchIndex
 from gui.handlers.thread_event_manager import ThreadEventManager
 from gui.libs.CTkMessagebox import messagebox
 
 
 class GameListFrame(customtkinter.CTkFrame):
+    # Events started for the games on a page, such as icon downloads, should use an ID starting with
+    # PAGE_EVENT_PREFIX so they are cancelled when the page changes, and PAGE_EVENT_PRIORITY so they
+    # run ahead of other background work
+    PAGE_EVENT_PREFIX = None
+    PAGE_EVENT_PRIORITY = 10
+
     def __init__(self, master, event_manager: ThreadEventManager):
         super().__init__(master, height=700)
         self.logger = Logger(__name__).get_logger()
@@ -16,6 +23,11 @@ class GameListFrame(customtkinter.CTkFrame):
         self.current_page = 1
         self.game_list = []
         self.searched_games = []
+        self.search_index = None
+        self.last_search_query = None
+        self._search_after_id = None
+        # rows of widgets created by create_row, which are reused for every page
+        self.rows = []
         self.build_frame()
 
     def configure_widgets(self, fetch_button_text="Get Games", state="disabled"):
@@ -30,7 +42,7 @@ class GameListFrame(customtkinter.CTkFrame):
         self.configure_widgets(fetch_button_text="Fetching...")
         self.event_manager.add_event(
             event_id="get_games",
-            func=self.get_game_list,
+            func=self.get_indexed_game_list,
             kwargs={},
             completion_functions=[lambda: self.configure_widgets(state="normal")],
             completion_funcs_with_result=[self.process_game_list],
@@ -47,10 +59,32 @@ class GameListFrame(customtkinter.CTkFrame):
             }
         }
 
-    def process_game_list(self, game_list):
+    def get_indexed_game_list(self):
+        """
+        Get the game list and build its search index on the worker thread, so that large lists do not block the UI.
+        """
+        output = self.get_game_list()
+        result = output.get("result") if isinstance(output, dict) else None
+        if result:
+            game_list = result[0]
+            output["result"] = (game_list, self.create_search_index(game_list))
+        return output
+
+    def create_search_index(self, game_list):
+        return SearchIndex(game_list, key=self.get_search_text)
+
+    def get_search_text(self, game):
+        """
+        Get the text that a search query is matched against for a game.
+        """
+        return game
+
+    def process_game_list(self, game_list, search_index=None):
         self.logger.debug(f"Processing received game list of length {len(game_list)}")
         self.game_list = game_list
         self.searched_games = game_list
+        self.search_index = search_index if search_index is not None else self.create_search_index(game_list)
+        self.last_search_query = None
         self.total_pages = (len(game_list) + constants.App.RESULTS_PER_GAME_PAGE.value - 1) // constants.App.RESULTS_PER_GAME_PAGE.value
         self.total_pages_label.configure(text=f"/ {self.total_pages}")
         self.update_results()
@@ -63,13 +97,14 @@ class GameListFrame(customtkinter.CTkFrame):
         self.refresh_button = customtkinter.CTkButton(self.refresh_frame, text="Get Games", width=100, corner_radius=50, command=self.get_game_list_button_event)
         self.refresh_button.grid(row=0, column=0, padx=5, pady=5)
 
-        search_frame = customtkinter.CTkFrame(self, corner_radius=50)
-        search_frame.grid(row=0, column=0, pady=(10, 0), padx=10, sticky="ne")
+        self.search_frame = customtkinter.CTkFrame(self, corner_radius=50)
+        self.search_frame.grid(row=0, column=0, pady=(10, 0), padx=10, sticky="ne")
 
-        self.search_entry = customtkinter.CTkEntry(search_frame, state="disabled", placeholder_text="Search")
+        self.search_entry = customtkinter.CTkEntry(self.search_frame, state="disabled", placeholder_text="Search")
         self.search_entry.grid(row=0, column=0, padx=10, pady=10, sticky="e")
         self.search_entry.bind("<Return>", self.perform_search)
-        self.search_button = customtkinter.CTkButton(search_frame, state="disabled", text="Go", width=60, command=self.perform_search)
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_button = customtkinter.CTkButton(self.search_frame, state="disabled", text="Go", width=60, command=self.perform_search)
         self.search_button.grid(row=0, column=1, padx=10, sticky="e", pady=10)
 
         self.result_frame = customtkinter.CTkScrollableFrame(self, width=650, height=20)
@@ -137,19 +172,23 @@ class GameListFrame(customtkinter.CTkFrame):
             self.prev_button.configure(state="normal")
             return
         self.update_in_progress = True
+        if self.PAGE_EVENT_PREFIX is not None:
+            self.event_manager.cancel_events(self.PAGE_EVENT_PREFIX)
         start_index = (self.current_page - 1) * constants.App.RESULTS_PER_GAME_PAGE.value
-        end_index = (start_index + constants.App.RESULTS_PER_GAME_PAGE.value) - 1
-        for widget in self.result_frame.winfo_children():
-            widget.grid_forget()
-
-        row_counter = 0
-        for i, game in enumerate(self.searched_games):
-            if i > end_index:
-                break
-            if i < start_index:
+        page_games = self.searched_games[start_index:start_index + constants.App.RESULTS_PER_GAME_PAGE.value]
+
+        row_index = 0
+        for game in page_games:
+            if row_index == len(self.rows):
+                self.rows.append(self.create_row())
+            row = self.rows[row_index]
+            if not self.update_row(row, game):
                 continue
-            self.add_game_to_frame(game, row_counter)
-            row_counter += 2
+            row["frame"].grid(row=row_index)
+            row_index += 1
+        # hide the rows that are not needed for this page, but keep them for later pages
+        for row in self.rows[row_index:]:
+            row["frame"].grid_remove()
 
         self.current_page_entry.configure(state="normal")
         self.current_page_entry.delete(0, customtkinter.END)
@@ -158,18 +197,53 @@ class GameListFrame(customtkinter.CTkFrame):
         self.prev_button.configure(state="normal")
         self.update_in_progress = False
 
-    def add_game_to_frame(self, game, row_counter):
-        customtkinter.CTkLabel(self.result_frame, text=game).grid(row=row_counter, column=0, padx=5, pady=5, sticky="ew")
+    def create_row(self):
+        """
+        Create the widgets for one row of results. Rows are created once and reused for every page.
+
+        Returns:
+            dict: The widgets of the row. The "frame" widget must be gridded in the result frame.
+        """
+        label = customtkinter.CTkLabel(self.result_frame)
+        label.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+        return {
+            "frame": label,
+        }
+
+    def update_row(self, row, game):
+        """
+        Show a game in a row created by create_row.
+
+        Args:
+            row (dict): The row returned by create_row.
+            game (str): The game to show.
+
+        Returns:
+            bool: True if the game is shown, False if it should be skipped, in which case the row is used for the next game.
+        """
+        row["frame"].configure(text=game)
+        return True
+
+    def schedule_search(self, event=None):
+        """
+        Search once the user has stopped typing for SEARCH_DEBOUNCE_DELAY milliseconds.
+        """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(constants.App.SEARCH_DEBOUNCE_DELAY.value, self.perform_search)
+
+    def search_games(self, query):
+        return self.search_index.search(query)
 
     def perform_search(self, *args):
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
         query = self.search_entry.get()
-        if query == "":
-            self.searched_games = self.game_list
-        else:
-            self.searched_games = []
-            for game in self.game_list:
-                if query.lower() in game.lower():
-                    self.searched_games.append(game)
+        if self.search_index is None or query == self.last_search_query:
+            return
+        self.last_search_query = query
+        self.searched_games = self.search_games(query)
         self.total_pages = (len(self.searched_games) + constants.App.RESULTS_PER_GAME_PAGE.value - 1) // constants.App.RESULTS_PER_GAME_PAGE.value
         self.total_pages_label.configure(text=f"/ {self.total_pages}")
         self.current_page = 1
@@ -28,7 +28,27 @@ class MyGamesFrame(GameListFrame):
             "result": (games,),
         }
 
-    def add_game_to_frame(self, game, row_counter):
+    def create_row(self):
+        game_frame = customtkinter.CTkFrame(self.result_frame, corner_radius=7, border_width=1, fg_color="transparent", height=200)
+        game_frame.grid(row=0, column=0, sticky="ew", pady=10, padx=10)
+        game_frame.grid_columnconfigure(0, weight=1)
+
+        game_label = customtkinter.CTkLabel(game_frame, font=("Arial", 15), anchor="w")
+        game_label.grid(row=0, column=0, sticky="nsew", padx=5, pady=10)
+
+        game_size_label = customtkinter.CTkLabel(game_frame, font=("Arial", 12), anchor="w")
+        game_size_label.grid(row=0, column=1, sticky="nsew", padx=5, pady=10)
+
+        delete_button = customtkinter.CTkButton(game_frame, text="Delete", width=100)
+        delete_button.grid(row=0, column=2, padx=5, pady=2)
+        return {
+            "frame": game_frame,
+            "name_label": game_label,
+            "size_label": game_size_label,
+            "delete_button": delete_button,
+        }
+
+    def update_row(self, row, game):
         def convert_bytes_to_suitable_unit(bytes):
             if bytes < 1024:
                 return f"{bytes} B"
@@ -41,19 +61,11 @@ class MyGamesFrame(GameListFrame):
             else:
                 return f"{bytes / 1024 / 1024 / 1024 / 1024:.2f} TB"
 
-        game_frame = customtkinter.CTkFrame(self.result_frame, corner_radius=7, border_width=1, fg_color="transparent", height=200)
-        game_frame.grid(row=row_counter, column=0, sticky="ew", pady=10, padx=10)
-        game_frame.grid_columnconfigure(0, weight=1)
-
-        game_label = customtkinter.CTkLabel(game_frame, text=game, font=("Arial", 15), anchor="w")
-        game_label.grid(row=0, column=0, sticky="nsew", padx=5, pady=10)
-
         game_size = (self.emulator_settings.game_directory / game).stat().st_size
-        game_size_label = customtkinter.CTkLabel(game_frame, text=convert_bytes_to_suitable_unit(game_size), font=("Arial", 12), anchor="w")
-        game_size_label.grid(row=0, column=1, sticky="nsew", padx=5, pady=10)
-
-        delete_button = customtkinter.CTkButton(game_frame, text="Delete", width=100, command=lambda: self.delete_game(game))
-        delete_button.grid(row=0, column=2, padx=5, pady=2)
+        row["name_label"].configure(text=game)
+        row["size_label"].configure(text=convert_bytes_to_suitable_unit(game_size))
+        row["delete_button"].configure(command=lambda: self.delete_game(game))
+        return True
 
     def get_current_roms_from_subdirectories(self):
         games = []
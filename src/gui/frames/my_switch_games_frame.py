@@ -1,8 +1,15 @@
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 import customtkinter
+from PIL import Image
 
+from core.config import constants
 from core.network.web import download_file
+from core.utils.images import create_thumbnail
+from core.utils.search import SearchIndex
+from core.utils.titledb import TitleDB
 from gui.frames.game_list_frame import GameListFrame
 from gui.handlers.progress.progress_handler import ProgressHandler
 from gui.libs.CTkMessagebox import messagebox
@@ -10,15 +17,24 @@ from gui.windows.saves_browser import SavesBrowser
 
 
 class MySwitchGamesFrame(GameListFrame):
+    PAGE_EVENT_PREFIX = "download_icon_"
+    PREFETCH_EVENT_PREFIX = "prefetch_icon_"
+    # the number of decoded icons kept in memory, enough for the pages either side of the current one
+    ICON_MEMORY_CACHE_SIZE = constants.App.RESULTS_PER_GAME_PAGE.value * 3
+    # icons are locked in stripes shared by many titles, so the number of locks does not grow with the library
+    ICON_LOCK_STRIPES = 32
+
     def __init__(self, master, cache, assets, event_manager, emulator_name, emulator_object):
         self.cache = cache
         self.assets = assets
         self.emulator_name = emulator_name
         self.event_manager = event_manager
         self.fetching_titledb = False
-        self.titledb = {}
+        self.titledb = None
         self.game_id_name_map = {}
         self.emulator_object = emulator_object
+        self.icon_images = OrderedDict()
+        self._icon_locks = [threading.Lock() for _ in range(self.ICON_LOCK_STRIPES)]
         super().__init__(master, event_manager)
         self.progress_handler = ProgressHandler(self.winfo_toplevel(), widget="window")
 
@@ -53,122 +69,244 @@ class MySwitchGamesFrame(GameListFrame):
             "result": (title_ids, ),
         }
 
-    def add_game_to_frame(self, game, row_counter):
-        # game can either be a title ID or a game name
-        title_id = None
-        name = None
-
-        if game.isnumeric():
-            title_id = game
-        else:
-            name = game
-
-        if title_id:
-            # if game is title ID, get name from title ID
-            meta = self.get_title_meta_from_id(title_id)
-            if meta is None:
-                return
-        elif name:
-            # if game is the name, get title ID from mapping and then get meta
-            title_id = self.game_id_name_map.get(name, None)
-            if not title_id:
-                return
-            meta = self.get_title_meta_from_id(title_id)
-
-        name = meta["name"]
-        description = meta["description"]
-        icon_url = meta["iconUrl"]
-        # add the title id and name to the mapping
-        self.game_id_name_map[name] = title_id
-        self.game_id_name_map[title_id] = name
+    def create_row(self):
         game_frame = customtkinter.CTkFrame(self.result_frame)
-        game_frame.grid(row=row_counter, column=0, padx=10, pady=5, sticky="nsew")
+        game_frame.grid(row=0, column=0, padx=10, pady=5, sticky="nsew")
         game_frame.grid_columnconfigure(1, weight=1)  # Allow the second column to expand
 
         # Game cover button
         game_cover = customtkinter.CTkButton(game_frame, hover_color=None, border_width=0, text="", image=self.assets.placeholder_icon)
         game_cover.grid(row=0, column=0, rowspan=3, padx=10, pady=5, sticky="nsew")  # Span 3 rows
-        self.event_manager.add_event(
-            event_id=f"download_icon_{title_id}",
-            func=self.download_icon,
-            kwargs={"title_id": title_id, "icon_url": icon_url, "button": game_cover},
-            completion_funcs_with_result=[self.update_game_cover],
-        )
 
         # Game name label
-        game_name_label = customtkinter.CTkLabel(game_frame, text=name, font=customtkinter.CTkFont("Arial", 16))
+        game_name_label = customtkinter.CTkLabel(game_frame, font=customtkinter.CTkFont("Arial", 16))
         game_name_label.grid(row=0, column=1, padx=10, columnspan=2, pady=5, sticky="nsew")
 
         # Game description text box
-        game_desc_text = customtkinter.CTkTextbox(game_frame, height=130, border_width=0, fg_color="transparent")
-        game_desc_text.insert(customtkinter.END, description)
-        game_desc_text.configure(state="disabled")  # Make the text box read-only
+        game_desc_text = customtkinter.CTkTextbox(game_frame, height=130, border_width=0, fg_color="transparent", state="disabled")
         game_desc_text.grid(row=1, column=1, padx=10, columnspan=2, pady=5, sticky="nsew")
 
         # Download mods button
         download_mods_button = customtkinter.CTkButton(game_frame, text="Download Mods", height=50, font=("Arial", 14))
-        download_mods_button.configure(command=lambda game=game, button=download_mods_button: self.download_mods_button_event(game, button))
         download_mods_button.grid(row=2, column=1, padx=10, pady=10, sticky="sw")
 
         # Download saves button
         download_saves_button = customtkinter.CTkButton(game_frame, text="Download Saves", height=50, font=("Arial", 14))
-        download_saves_button.configure(command=lambda game=game, button=download_saves_button: self.download_saves_button_event(game, button))
         download_saves_button.grid(row=2, column=2, padx=10, pady=10, sticky="se")
 
-        # remove title ID from list and add name instead
-        self.game_list.remove(game)
-        self.game_list.append(name)
+        row = {
+            "frame": game_frame,
+            "cover": game_cover,
+            "name_label": game_name_label,
+            "description": game_desc_text,
+            "game": None,
+        }
+        # the row is reused for other games, so the handlers look up the game shown when they are called
+        download_mods_button.configure(command=lambda: self.download_mods_button_event(row["game"], download_mods_button))
+        download_saves_button.configure(command=lambda: self.download_saves_button_event(row["game"], download_saves_button))
+        return row
+
+    def get_search_text(self, game, titledb=None):
+        # games are title IDs, so search by the name from the TitleDB when it is available
+        titledb = titledb if titledb is not None else self.titledb
+        meta = titledb.get(game) if titledb is not None else None
+        return meta["name"] if meta is not None and meta["name"] else game
+
+    def update_row(self, row, game):
+        """
+        Show a title in a row, skipping titles that are not in the TitleDB.
+
+        Returns:
+            bool: True if the title is shown, False if it was skipped.
+        """
+        title_id = game
+        meta = self.get_title_meta_from_id(title_id)
+        if meta is None:
+            return False
 
-    def download_icon(self, title_id, icon_url, button):
-        cache_query_result = self.cache.get_file(f"{title_id}_icon")
-        if cache_query_result["status"]:
-            icon_path = cache_query_result["path"]
-            return {
-                "result": (button, icon_path, )
-            }
-        download_result = download_file(icon_url, Path(f"{title_id}.png").resolve())
-        if not download_result["status"]:
-            return {}
+        name = meta["name"]
+        description = meta["description"]
+        icon_url = meta["iconUrl"]
+        # add the title id and name to the mapping
+        self.game_id_name_map[name] = title_id
+        self.game_id_name_map[title_id] = name
 
-        icon_path = download_result["download_path"]
-        add_to_cache_result = self.cache.add_file(f"{title_id}_icon", icon_path)
-        if not add_to_cache_result["status"]:
-            return {}
+        row["game"] = game
+        row["name_label"].configure(text=name)
+        row["description"].configure(state="normal")
+        row["description"].delete("1.0", customtkinter.END)
+        row["description"].insert(customtkinter.END, description or "")
+        row["description"].configure(state="disabled")  # Make the text box read-only
+
+        icon_image = self.get_icon_image(title_id)
+        if icon_image is not None:
+            row["cover"].configure(image=icon_image)
+            return True
+        row["cover"].configure(image=self.assets.placeholder_icon)
+        # the result only holds the icon, so a duplicate request for the same icon can share the download
+        self.event_manager.add_event(
+            event_id=f"download_icon_{title_id}",
+            func=self.get_icon_thumbnail,
+            kwargs={"title_id": title_id, "icon_url": icon_url},
+            completion_funcs_with_result=[lambda icon, title_id=title_id, button=row["cover"]: self.update_game_cover(button, title_id, icon)],
+            event_class="image",
+            on_duplicate="coalesce",
+            priority=self.PAGE_EVENT_PRIORITY,
+            cancellable=True,
+        )
+        return True
+
+    def update_results(self):
+        # icons being prefetched for the previous page are no longer needed
+        self.event_manager.cancel_events(self.PREFETCH_EVENT_PREFIX)
+        super().update_results()
+        self.prefetch_next_page_icons()
+
+    def prefetch_next_page_icons(self):
+        """
+        Queue the icons of the next page behind those of the current page, so that they are ready when the user turns the page.
+        """
+        if self.titledb is None:
+            return
+        start_index = self.current_page * constants.App.RESULTS_PER_GAME_PAGE.value
+        for title_id in self.searched_games[start_index:start_index + constants.App.RESULTS_PER_GAME_PAGE.value]:
+            if title_id in self.icon_images:
+                continue
+            meta = self.titledb.get(title_id)
+            if meta is None or not meta["iconUrl"]:
+                continue
+            self.event_manager.add_event(
+                event_id=f"prefetch_icon_{title_id}",
+                func=self.get_icon_thumbnail,
+                kwargs={"title_id": title_id, "icon_url": meta["iconUrl"]},
+                completion_funcs_with_result=[lambda icon, title_id=title_id: self.store_icon_image(title_id, icon)],
+                event_class="image",
+                on_duplicate="reject",
+                cancellable=True,
+            )
 
-        cache_query_result = self.cache.get_file(f"{title_id}_icon")
-        if not cache_query_result:
-            return {}
-        icon_path = cache_query_result["path"]
+    def get_icon_image(self, title_id):
+        icon_image = self.icon_images.get(title_id)
+        if icon_image is not None:
+            self.icon_images.move_to_end(title_id)
+        return icon_image
+
+    def store_icon_image(self, title_id, icon):
+        icon_image = self.assets.create_image(icon, constants.App.GAME_ICON_SIZE.value)
+        self.icon_images[title_id] = icon_image
+        self.icon_images.move_to_end(title_id)
+        while len(self.icon_images) > self.ICON_MEMORY_CACHE_SIZE:
+            self.icon_images.popitem(last=False)
+        return icon_image
+
+    def _get_icon_lock(self, title_id):
+        return self._icon_locks[hash(title_id) % self.ICON_LOCK_STRIPES]
+
+    def get_icon_thumbnail(self, title_id, icon_url, cancellation_token=None):
+        """
+        Get the icon of a title resized to the size it is displayed at, downloading it and storing
+        the thumbnail in the cache if needed. The icon is decoded here so that the main thread only
+        has to display it.
+
+        Returns:
+            dict: The decoded icon as a PIL image in the result, or no result if it could not be loaded.
+        """
+        width, height = constants.App.GAME_ICON_SIZE.value
+        cache_key = f"{title_id}_icon_{width}x{height}"
+        # the prefetcher and the current page can ask for the same icon at the same time
+        with self._get_icon_lock(title_id):
+            cache_query_result = self.cache.get_file(cache_key)
+            if not cache_query_result["status"]:
+                if cancellation_token is not None and cancellation_token.is_cancelled():
+                    return {}
+                download_result = download_file(icon_url, Path(f"{title_id}.png").resolve())
+                if not download_result["status"]:
+                    return {}
+                icon_path = download_result["download_path"]
+                thumbnail_result = create_thumbnail(icon_path, Path(f"{cache_key}.jpg").resolve(), (width, height))
+                icon_path.unlink(missing_ok=True)
+                if not thumbnail_result["status"]:
+                    return {}
+                cache_query_result = self.cache.add_file(cache_key, thumbnail_result["thumbnail_path"])
+                if not cache_query_result["status"]:
+                    return {}
+            try:
+                with Image.open(cache_query_result["path"]) as image:
+                    icon = image.copy()
+            except OSError as error:
+                self.logger.error("Failed to load icon of %s: %s", title_id, error)
+                return {}
 
         return {
-            "result": (button, icon_path, )
+            "result": (icon, )
         }
 
-    def update_game_cover(self, button, image):
-        button.configure(image=self.assets.create_image(image, (224, 224)))
+    def update_game_cover(self, button, title_id, icon):
+        button.configure(image=self.store_icon_image(title_id, icon))
 
     def get_title_meta_from_id(self, title_id):
-        if not self.titledb:
+        if self.titledb is None:
             self.assert_titledb()
-        return self.titledb.get(str(title_id))
+            return None
+        return self.titledb.get(title_id)
+
+    def load_titledb(self):
+        """
+        Open the TitleDB from the cache and build a search index that searches by name.
+        This runs on a worker thread, apply_titledb swaps the results in on the main thread.
+        """
+        # pin the entry before looking it up so that the sweeper cannot remove the file while it is open
+        self.cache.pin("TitleDB_index")
+        cache_query = self.cache.get_file("TitleDB_index")
+        if not cache_query["status"]:
+            # the entry expired or was evicted after assert_titledb found it
+            self.cache.unpin("TitleDB_index")
+            return {
+                "result": (None, None, None),
+            }
+        try:
+            titledb = TitleDB(cache_query["path"])
+        except Exception:
+            self.cache.unpin("TitleDB_index")
+            raise
+        game_list = self.game_list
+        search_index = SearchIndex(game_list, key=lambda game: self.get_search_text(game, titledb)) if game_list else None
+        return {
+            "result": (titledb, game_list, search_index),
+        }
 
-    def load_titledb(self, titledb=None):
+    def apply_titledb(self, titledb, game_list, search_index):
         if titledb is None:
-            titledb = self.cache.get_json("TitleDB")["data"]
+            self.assert_titledb()
+            return
+        if self.titledb is not None:
+            self.titledb.close()
+            self.cache.unpin("TitleDB_index")
         self.titledb = titledb
-        return {}
+        # the index was built before the names were known, so swap in the one that searches by name,
+        # unless the game list has been refreshed since, in which case it was built with the TitleDB already
+        if search_index is not None and game_list is self.game_list:
+            self.search_index = search_index
+            self.last_search_query = None
+            if self.search_entry.get():
+                self.perform_search()
+                return
+        self.update_results()
 
     def assert_titledb(self, ):
         if self.fetching_titledb:
             return
-        if self.titledb:
+        if self.titledb is not None:
             return
-        cache_query = self.cache.get_file("TitleDB")
+        cache_query = self.cache.get_file("TitleDB_index")
         if cache_query["status"]:
             self.event_manager.add_event(
                 event_id="load_titledb",
                 func=self.load_titledb,
                 kwargs={},
+                event_class="disk",
+                on_duplicate="reject",
+                completion_funcs_with_result=[self.apply_titledb],
                 error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Error", "An error occurred while attempting to load the TitleDB.")],
             )
             return
@@ -178,42 +316,47 @@ class MySwitchGamesFrame(GameListFrame):
             event_id="fetch_titledb",
             func=self.download_titledb,
             kwargs={},
+            on_duplicate="reject",
             error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Error", "An unknown error occured while attempting to download the titleDB.")],
-            completion_functions=[lambda: setattr(self, "fetching_titledb", False)]
+            completion_functions=[lambda: setattr(self, "fetching_titledb", False)],
+            completion_funcs_with_result=[self.apply_titledb],
         )
 
     def download_titledb(self):
-        self.progress_handler.start_operation("Downloading TitleDB", total_units=0, units="MiB", status="Downloading...")
+        self.progress_handler.start_operation("Downloading TitleDB", total_units=0, units=" titles", status="Downloading...")
         download_result = self.emulator_object.download_titledb(progress_handler=self.progress_handler)
 
         if not download_result["status"]:
             self.fetching_titledb = False
+            if "cancelled" in download_result["message"]:
+                return {
+                    "message": {
+                        "function": messagebox.showinfo,
+                        "arguments": (self.winfo_toplevel(), "TitleDB", "The TitleDB download was cancelled"),
+                    }
+                }
             return {
                 "message": {
                     "function": messagebox.showerror,
                     "arguments": (self.winfo_toplevel(), "Error", f"An error occured while attempting to download the TitleDB:\n\n{download_result['message']}"),
                 }
             }
-        download_path = download_result["download_path"]
-
-        self.cache.add_file(key="TitleDB", file=download_path, ttl=60*60*24*7)
 
-        cache_lookup_result = self.cache.get_json("TitleDB")
-        if not cache_lookup_result:
+        add_to_cache_result = self.cache.add_file(key="TitleDB_index", file=download_result["database_path"], ttl=60*60*24*7)
+        if not add_to_cache_result["status"]:
             self.fetching_titledb = False
             return {
                 "message": {
                     "function": messagebox.showerror,
-                    "arguments": (self.winfo_toplevel(), "Error", "An error occured while attempting to lookup the TitleDB in the cache."),
+                    "arguments": (self.winfo_toplevel(), "Error", "An error occured while attempting to add the TitleDB to the cache."),
                 }
             }
 
-        titledb = cache_lookup_result["data"]
-
-        self.load_titledb(titledb, refetch_on_error=False)
+        load_result = self.load_titledb()
 
         self.fetching_titledb = False
         return {
+            "result": load_result["result"],
             "message": {
                 "function": messagebox.showsuccess,
                 "arguments": (self.winfo_toplevel(), "Success", "TitleDB downloaded successfully.")
@@ -3,35 +3,45 @@ import webbrowser
 import customtkinter
 
 from core.logging.logger import Logger
-from core.network.myrient import get_game_download_url, get_list_of_games
+from core.network.myrient import apply_catalogue_diff, diff_catalogues, get_catalogue, get_game_download_url, parse_game_name
+from core.utils.search import RankedSearchIndex
 from gui.frames.game_list_frame import GameListFrame
 from gui.libs.CTkMessagebox import messagebox
 
 
 class MyrientGameListFrame(GameListFrame):
+    ALL_REGIONS = "All Regions"
+    ALL_LANGUAGES = "All Languages"
+
     def __init__(self, master, event_manager, cache, myrient_path, console_name, download_button_event):
         self.myrient_path = myrient_path
         self.console_name = console_name
         self.cache = cache
         self.download_button_event = download_button_event
+        self.catalogue_cache_key = f"{console_name}_catalogue"
+        # maps each game name to its size, modification time and download URL
+        self.catalogue = {}
+        self.catalogue_needs_refresh = False
         super().__init__(master=master, event_manager=event_manager)
         self.logger = Logger(__name__).get_logger()
 
     def get_game_list(self):
-        cache_lookup_result = self.cache.get_json(f"{self.console_name}_games")
+        cache_lookup_result = self.cache.get_json(self.catalogue_cache_key)
         if cache_lookup_result["status"]:
-            self.logger.info("game list cache hit")
-            game_list = cache_lookup_result["data"]
+            self.logger.info("game catalogue cache hit")
+            self.catalogue = cache_lookup_result["data"]
+            # show the stored catalogue straight away and check the listing for changes afterwards
+            self.catalogue_needs_refresh = True
             return {
-                "result": (game_list, ),
+                "result": (list(self.catalogue), ),
                 "message": {
                     "function": messagebox.showsuccess,
                     "arguments": (self.winfo_toplevel(), "Success", "Successfully retrieved games from cache.")
                 }
             }
-        self.logger.info("game list cache miss")
-        scrape_result = get_list_of_games(myrient_path=self.myrient_path)
-        if not scrape_result["status"]:
+        self.logger.info("game catalogue cache miss")
+        catalogue_result = get_catalogue(myrient_path=self.myrient_path)
+        if not catalogue_result["status"]:
             return {
                 "result": ([], ),
                 "message": {
@@ -39,23 +49,168 @@ class MyrientGameListFrame(GameListFrame):
                     "arguments": (self.winfo_toplevel(), "Error", "Failed to fetch games.")
                 }
             }
-        self.cache.add_json(f"{self.console_name}_games", scrape_result["games"])
+        self.catalogue = catalogue_result["catalogue"]
+        self.cache.add_json(self.catalogue_cache_key, self.catalogue)
         return {
-            "result": (scrape_result["games"],),
+            "result": (list(self.catalogue),),
             "message": {
                 "function": messagebox.showsuccess,
                 "arguments": (self.winfo_toplevel(), "Success", "Successfully fetched games.")
             }
         }
 
-    def add_game_to_frame(self, game, row_counter):
-        game_download_url = get_game_download_url(game_name=game, myrient_path=self.myrient_path)
-        entry = customtkinter.CTkEntry(self.result_frame, width=400)
-        entry.insert(0, game)
-        entry.configure(state="disabled")
-
-        entry.grid(row=row_counter, column=0, padx=10, pady=5, sticky="w")
-        button = customtkinter.CTkButton(self.result_frame, text="Download")
-        button.configure(command=lambda button=button, game=game: self.download_button_event(game, self.myrient_path))
-        button.bind("<Shift-Button-1>", lambda event, game=game: webbrowser.open(game_download_url))
-        button.grid(row=row_counter, column=1, padx=10, pady=5, sticky="e")
+    def refresh_catalogue(self):
+        """
+        Fetch the listing and apply only the games that were added, changed or removed to the stored catalogue.
+
+        Returns:
+            dict: The new game list and its search index, or no result if nothing changed.
+        """
+        catalogue_result = get_catalogue(myrient_path=self.myrient_path)
+        if not catalogue_result["status"]:
+            self.logger.warning("Failed to refresh the %s catalogue: %s", self.console_name, catalogue_result["message"])
+            return {}
+        diff = diff_catalogues(self.catalogue, catalogue_result["catalogue"])
+        if not diff["added"] and not diff["removed"]:
+            self.logger.info("The %s catalogue is up to date", self.console_name)
+            return {}
+        self.logger.info("Applying %s additions and %s removals to the %s catalogue", len(diff["added"]), len(diff["removed"]), self.console_name)
+        catalogue = apply_catalogue_diff(dict(self.catalogue), diff)
+        self.cache.add_json(self.catalogue_cache_key, catalogue)
+        # keep the order of the listing, which is sorted by the server
+        game_list = [game for game in catalogue_result["catalogue"] if game in catalogue]
+        return {
+            "result": (catalogue, game_list, self.create_search_index(game_list)),
+        }
+
+    def apply_catalogue_refresh(self, catalogue, game_list, search_index):
+        region = self.region_menu.get()
+        language = self.language_menu.get()
+        page = self.current_page
+        self.catalogue = catalogue
+        self.process_game_list(game_list, search_index)
+        # keep the filters, search and page the user had before the refresh
+        if region in self.region_menu.cget("values"):
+            self.region_menu.set(region)
+        if language in self.language_menu.cget("values"):
+            self.language_menu.set(language)
+        self.filter_changed()
+        page = min(page, max(self.total_pages, 1))
+        if page != self.current_page:
+            self.current_page = page
+            self.update_results()
+
+    def build_frame(self):
+        super().build_frame()
+        filter_frame = customtkinter.CTkFrame(self.search_frame, fg_color="transparent")
+        filter_frame.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="ew")
+        self.region_menu = customtkinter.CTkOptionMenu(filter_frame, values=[self.ALL_REGIONS], width=120, state="disabled", command=self.filter_changed)
+        self.region_menu.grid(row=0, column=0, padx=(0, 5))
+        self.language_menu = customtkinter.CTkOptionMenu(filter_frame, values=[self.ALL_LANGUAGES], width=120, state="disabled", command=self.filter_changed)
+        self.language_menu.grid(row=0, column=1, padx=5)
+        self.fuzzy_checkbox = customtkinter.CTkCheckBox(filter_frame, text="Fuzzy", width=60, state="disabled", command=self.filter_changed)
+        self.fuzzy_checkbox.grid(row=0, column=2, padx=(5, 0))
+
+    def configure_widgets(self, fetch_button_text="Get Games", state="disabled"):
+        super().configure_widgets(fetch_button_text=fetch_button_text, state=state)
+        self.region_menu.configure(state=state)
+        self.language_menu.configure(state=state)
+        self.fuzzy_checkbox.configure(state=state)
+
+    def create_search_index(self, game_list):
+        # the tags of every game are parsed once here so that filtering does not need to parse them again
+        return RankedSearchIndex(game_list, fields=parse_game_name)
+
+    def process_game_list(self, game_list, search_index=None):
+        super().process_game_list(game_list, search_index)
+        if self.catalogue_needs_refresh:
+            self.catalogue_needs_refresh = False
+            self.event_manager.add_event(
+                event_id=f"refresh_{self.console_name}_catalogue",
+                func=self.refresh_catalogue,
+                kwargs={},
+                completion_funcs_with_result=[self.apply_catalogue_refresh],
+                on_duplicate="reject",
+            )
+        region_counts = {}
+        language_counts = {}
+        for fields in self.search_index.fields:
+            for region in fields["regions"]:
+                region_counts[region] = region_counts.get(region, 0) + 1
+            for language in fields["languages"]:
+                language_counts[language] = language_counts.get(language, 0) + 1
+        # list the most common regions and languages first
+        self.region_menu.configure(values=[self.ALL_REGIONS] + sorted(region_counts, key=region_counts.get, reverse=True))
+        self.region_menu.set(self.ALL_REGIONS)
+        self.language_menu.configure(values=[self.ALL_LANGUAGES] + sorted(language_counts, key=language_counts.get, reverse=True))
+        self.language_menu.set(self.ALL_LANGUAGES)
+
+    def filter_changed(self, *args):
+        self.last_search_query = None
+        self.perform_search()
+
+    def search_games(self, query):
+        region = self.region_menu.get()
+        language = self.language_menu.get()
+        fuzzy = self.fuzzy_checkbox.get() == 1
+        if region == self.ALL_REGIONS and language == self.ALL_LANGUAGES and not fuzzy:
+            return super().search_games(query)
+
+        def matches_filters(fields):
+            # games released worldwide match every region
+            if region != self.ALL_REGIONS and region not in fields["regions"] and "World" not in fields["regions"]:
+                return False
+            if language != self.ALL_LANGUAGES and language not in fields["languages"]:
+                return False
+            return True
+
+        if fuzzy:
+            return self.search_index.ranked_search(query, matches_filters)
+        filtered_games = set(self.search_index.ranked_search("", matches_filters))
+        return [game for game in super().search_games(query) if game in filtered_games]
+
+    def create_row(self):
+        row_frame = customtkinter.CTkFrame(self.result_frame, fg_color="transparent")
+        row_frame.grid(row=0, column=0, sticky="ew")
+        row_frame.grid_columnconfigure(0, weight=1)
+        entry = customtkinter.CTkEntry(row_frame, width=400, state="disabled")
+        entry.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        size_label = customtkinter.CTkLabel(row_frame, width=80, anchor="e")
+        size_label.grid(row=0, column=1, padx=5, pady=5, sticky="e")
+        button = customtkinter.CTkButton(row_frame, text="Download")
+        button.grid(row=0, column=2, padx=10, pady=5, sticky="e")
+        row = {
+            "frame": row_frame,
+            "entry": entry,
+            "size_label": size_label,
+            "button": button,
+            "game": None,
+        }
+        # the row is reused for other games, so the handlers look up the game shown when they are called
+        button.configure(command=lambda: self.download_button_event(row["game"], self.myrient_path))
+        button.bind("<Shift-Button-1>", lambda event: webbrowser.open(self.get_download_url(row["game"])))
+        return row
+
+    def update_row(self, row, game):
+        row["game"] = game
+        row["entry"].configure(state="normal")
+        row["entry"].delete(0, customtkinter.END)
+        row["entry"].insert(0, game)
+        row["entry"].configure(state="disabled")
+        size = self.catalogue.get(game, {}).get("size")
+        row["size_label"].configure(text=self.format_size(size) if size is not None else "")
+        return True
+
+    def get_download_url(self, game):
+        entry = self.catalogue.get(game)
+        if entry is not None:
+            return entry["url"]
+        return get_game_download_url(game_name=game, myrient_path=self.myrient_path)
+
+    @staticmethod
+    def format_size(size):
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024:
+                return f"{size} {unit}" if unit == "B" else f"{size:.2f} {unit}"
+            size /= 1024
+        return f"{size:.2f} TB"
@@ -140,6 +140,7 @@ class RyujinxFrame(EmulatorFrame):
         self.configure_buttons("disabled", launch_ryujinx_button_text="Launching...")
         self.event_manager.add_event(
             event_id="launch_ryujinx",
+            event_class="process",
             func=self.launch_ryujinx_handler,
             kwargs={"update_mode": update_mode},
             completion_functions=[lambda: self.configure_buttons("normal", launch_ryujinx_button_text="Launch Ryujinx")],
@@ -212,6 +213,7 @@ class RyujinxFrame(EmulatorFrame):
 
     def install_ryujinx_handler(self, update_mode=False, archive_path=None):
         custom_install = archive_path is not None
+        streamed = False
         if archive_path is None:
             release_fetch_result = self.ryujinx.get_release()
             if not release_fetch_result["status"]:
@@ -228,28 +230,39 @@ class RyujinxFrame(EmulatorFrame):
                         "status": True
                     }
                 self.configure_buttons(launch_ryujinx_button_text="Updating...")
-            total_units = release_fetch_result["release"]["size"] / 1024 / 1024
-            self.main_progress_frame.start_operation(title="Install Ryujinx", total_units=total_units, units=" MiB", status="Downloading...")
-            download_result = self.ryujinx.download_release(release_fetch_result["release"], progress_handler=self.main_progress_frame)
-            if not download_result["status"]:
-                if "cancelled" in download_result["message"]:
+            if self.settings.delete_files_after_installing:
+                # the archive would be deleted afterwards anyway, so extract it straight from the server
+                stream_result = self.ryujinx.open_release_stream(release_fetch_result["release"])
+                streamed = stream_result["status"]
+                if streamed:
+                    archive_path = stream_result["file"]
+            if not streamed:
+                total_units = release_fetch_result["release"]["size"] / 1024 / 1024
+                self.main_progress_frame.start_operation(title="Install Ryujinx", total_units=total_units, units=" MiB", status="Downloading...")
+                download_result = self.ryujinx.download_release(release_fetch_result["release"], progress_handler=self.main_progress_frame)
+                if not download_result["status"]:
+                    if "cancelled" in download_result["message"]:
+                        return {
+                            "message": {
+                                "function": messagebox.showinfo,
+                                "arguments": (self.winfo_toplevel(), "Ryujinx", "Download was cancelled"),
+                            }
+                        }
                     return {
                         "message": {
-                            "function": messagebox.showinfo,
-                            "arguments": (self.winfo_toplevel(), "Ryujinx", "Download was cancelled"),
+                            "function": messagebox.showerror,
+                            "arguments": (self.winfo_toplevel(), "Ryujinx", f"Failed to download the latest release of Ryujinx:\n\n{download_result['message']}"),
                         }
                     }
-                return {
-                    "message": {
-                        "function": messagebox.showerror,
-                        "arguments": (self.winfo_toplevel(), "Ryujinx", f"Failed to download the latest release of Ryujinx:\n\n{download_result['message']}"),
-                    }
-                }
 
-            archive_path = download_result["download_path"]
+                archive_path = download_result["download_path"]
 
-        self.main_progress_frame.start_operation(title="Install Ryujinx", total_units=0, units=" Files", status="Extracting...")
-        extract_result = self.ryujinx.extract_release(archive_path, progress_handler=self.main_progress_frame)
+        self.main_progress_frame.start_operation(title="Install Ryujinx", total_units=0, units=" MiB", status="Extracting...")
+        try:
+            extract_result = self.ryujinx.extract_release(archive_path, progress_handler=self.main_progress_frame)
+        finally:
+            if streamed:
+                archive_path.close()
         if not extract_result["status"]:
             if "cancelled" in extract_result["message"]:
                 return {
@@ -266,7 +279,7 @@ class RyujinxFrame(EmulatorFrame):
             }
 
         self.metadata.set_version("ryujinx", release_fetch_result["release"]["version"] if not custom_install else "")
-        if not custom_install and self.settings.delete_files_after_installing:
+        if not custom_install and not streamed and self.settings.delete_files_after_installing:
             archive_path.unlink()
         return {
             "message": {
@@ -285,6 +298,7 @@ class RyujinxFrame(EmulatorFrame):
         self.configure_buttons(delete_ryujinx_button_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_ryujinx",
+            event_class="disk",
             func=self.delete_ryujinx_handler,
             error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Error", "An unexpected error occured while deleting Ryujinx. Please check the logs for more information and report this issue.")],
             completion_functions=[lambda: self.configure_buttons(state="normal")],
@@ -330,6 +344,7 @@ class RyujinxFrame(EmulatorFrame):
         self.configure_data_buttons(import_text="Importing...")
         self.event_manager.add_event(
             event_id="import_ryujinx_data",
+            event_class="disk",
             func=self.import_data_handler,
             kwargs={"import_directory": directory, "folders": folders, "save_folder": import_option == "Save Data"},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -384,6 +399,7 @@ class RyujinxFrame(EmulatorFrame):
 
         self.event_manager.add_event(
             event_id="export_ryujinx_data",
+            event_class="disk",
             func=self.export_data_handler,
             kwargs={"export_directory": export_directory, "folders": folders, "save_folder": self.export_optionmenu.get() == "Save Data"},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -430,6 +446,7 @@ class RyujinxFrame(EmulatorFrame):
         self.configure_data_buttons(delete_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_ryujinx_data",
+            event_class="disk",
             func=self.delete_data_handler,
             kwargs={"folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
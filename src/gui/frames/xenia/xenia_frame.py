@@ -148,6 +148,7 @@ class XeniaFrame(EmulatorFrame):
         self.configure_buttons(state="disabled", launch_xenia_button_text="Checking for updates..." if auto_update else "Launching...")
         self.event_manager.add_event(
             event_id="launch_xenia",
+            event_class="process",
             func=self.launch_xenia_handler,
             kwargs={"auto_update": auto_update},
             completion_functions=[lambda: self.configure_buttons(state="normal")],
@@ -219,6 +220,7 @@ class XeniaFrame(EmulatorFrame):
 
     def install_xenia_handler(self, update_mode=False, archive_path=None):
         custom_install = archive_path is not None
+        streamed = False
 
         if archive_path is None:
             release_fetch_result = self.xenia.get_xenia_release()
@@ -236,27 +238,38 @@ class XeniaFrame(EmulatorFrame):
                         "status": True
                     }
                 self.configure_buttons(launch_xenia_button_text="Updating...")
-            self.main_progress_frame.start_operation(title="Installing Xenia", total_units=release_fetch_result["release"]["size"] / 1024 / 1024, units=" MiB", status="Downloading...")
-            download_result = self.xenia.download_xenia_release(release_fetch_result["release"], progress_handler=self.main_progress_frame)
-            if not download_result["status"]:
-                if "cancelled" in download_result["message"]:
+            if self.settings.delete_files_after_installing:
+                # the archive would be deleted afterwards anyway, so extract it straight from the server
+                stream_result = self.xenia.open_release_stream(release_fetch_result["release"])
+                streamed = stream_result["status"]
+                if streamed:
+                    archive_path = stream_result["file"]
+            if not streamed:
+                self.main_progress_frame.start_operation(title="Installing Xenia", total_units=release_fetch_result["release"]["size"] / 1024 / 1024, units=" MiB", status="Downloading...")
+                download_result = self.xenia.download_xenia_release(release_fetch_result["release"], progress_handler=self.main_progress_frame)
+                if not download_result["status"]:
+                    if "cancelled" in download_result["message"]:
+                        return {
+                            "message": {
+                                "function": messagebox.showinfo,
+                                "arguments": (self.winfo_toplevel(), "Xenia", "Cancelled download of Xenia"),
+                            }
+                        }
                     return {
                         "message": {
-                            "function": messagebox.showinfo,
-                            "arguments": (self.winfo_toplevel(), "Xenia", "Cancelled download of Xenia"),
+                            "function": messagebox.showerror,
+                            "arguments": (self.winfo_toplevel(), "Xenia", f"Failed to download the latest {self.settings.xenia.release_channel} release of Xenia:\n\n{download_result['message']}"),
                         }
                     }
-                return {
-                    "message": {
-                        "function": messagebox.showerror,
-                        "arguments": (self.winfo_toplevel(), "Xenia", f"Failed to download the latest {self.settings.xenia.release_channel} release of Xenia:\n\n{download_result['message']}"),
-                    }
-                }
 
-            archive_path = download_result["download_path"]
+                archive_path = download_result["download_path"]
 
-        self.main_progress_frame.start_operation(title="Installing Xenia", total_units=0, units=" Files", status="Extracting...")
-        extract_result = self.xenia.extract_xenia_release(archive_path, progress_handler=self.main_progress_frame)
+        self.main_progress_frame.start_operation(title="Installing Xenia", total_units=0, units=" MiB", status="Extracting...")
+        try:
+            extract_result = self.xenia.extract_xenia_release(archive_path, progress_handler=self.main_progress_frame)
+        finally:
+            if streamed:
+                archive_path.close()
         if not extract_result["status"]:
             if "cancelled" in extract_result["message"]:
                 return {
@@ -273,7 +286,7 @@ class XeniaFrame(EmulatorFrame):
             }
 
         self.metadata.set_version(f"xenia_{self.settings.xenia.release_channel}", release_fetch_result["release"]["version"] if not custom_install else "")
-        if not custom_install and self.settings.delete_files_after_installing:
+        if not custom_install and not streamed and self.settings.delete_files_after_installing:
             archive_path.unlink()
         return {
             "message": {
@@ -292,6 +305,7 @@ class XeniaFrame(EmulatorFrame):
         self.configure_buttons(delete_xenia_button_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_xenia",
+            event_class="disk",
             func=self.delete_xenia_handler,
             error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Error", "An unexpected error occured while deleting Xenia. Please check the logs for more information and report this issue.")],
             completion_functions=[lambda: self.configure_buttons(state="normal")],
@@ -332,6 +346,7 @@ class XeniaFrame(EmulatorFrame):
         self.configure_data_buttons(import_text="Importing...")
         self.event_manager.add_event(
             event_id="import_xenia_data",
+            event_class="disk",
             func=self.import_data_handler,
             kwargs={"import_directory": directory, "folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -385,6 +400,7 @@ class XeniaFrame(EmulatorFrame):
 
         self.event_manager.add_event(
             event_id="export_xenia_data",
+            event_class="disk",
             func=self.export_data_handler,
             kwargs={"export_directory": export_directory, "folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -430,6 +446,7 @@ class XeniaFrame(EmulatorFrame):
         self.configure_data_buttons(delete_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_xenia_data",
+            event_class="disk",
             func=self.delete_data_handler,
             kwargs={"folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -163,6 +163,7 @@ class YuzuFrame(EmulatorFrame):
         self.configure_buttons(launch_yuzu_button_text="Launching...")
         self.event_manager.add_event(
             event_id="launch_yuzu",
+            event_class="process",
             func=self.launch_yuzu_handler,
             completion_functions=[lambda: self.configure_buttons(state="normal")],
             error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Launch Yuzu", "An unexpected error has occured while launching Yuzu.\n\nPlease check the logs for more information and report this issue.")],
@@ -230,7 +231,7 @@ class YuzuFrame(EmulatorFrame):
                     "arguments": (self.winfo_toplevel(), "Install Yuzu", f"The archive provided is not a valid yuzu {self.settings.yuzu.release_channel.replace("_", " ")} release."),
                 }
             }
-        self.main_progress_frame.start_operation("Installing Yuzu", 0, " Files", "Extracting...")
+        self.main_progress_frame.start_operation("Installing Yuzu", 0, " MiB", "Extracting...")
         install_status = self.yuzu.install_yuzu(archive_path, progress_handler=self.main_progress_frame)
         if not install_status["status"]:
             if "cancelled" in install_status["message"]:
@@ -260,6 +261,7 @@ class YuzuFrame(EmulatorFrame):
         self.configure_buttons(delete_yuzu_button_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_yuzu",
+            event_class="disk",
             func=self.delete_yuzu_handler,
             completion_functions=[lambda: self.configure_buttons(state="normal")],
             error_functions=[lambda: messagebox.showerror(self.winfo_toplevel(), "Delete Yuzu", "An unexpected error has occured while deleting Yuzu.\n\nPlease check the logs for more information and report this issue either on the GitHub page or Discord server.")],
@@ -304,6 +306,7 @@ class YuzuFrame(EmulatorFrame):
         self.configure_data_buttons(import_text="Importing...")
         self.event_manager.add_event(
             event_id="import_yuzu_data",
+            event_class="disk",
             func=self.import_data_handler,
             kwargs={"import_directory": directory, "folders": folders, "save_folder": import_option == "Save Data"},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -358,6 +361,7 @@ class YuzuFrame(EmulatorFrame):
 
         self.event_manager.add_event(
             event_id="export_yuzu_data",
+            event_class="disk",
             func=self.export_data_handler,
             kwargs={"export_directory": export_directory, "folders": folders, "save_folder": self.yuzu_export_optionmenu.get() == "Save Data"},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -404,6 +408,7 @@ class YuzuFrame(EmulatorFrame):
         self.configure_data_buttons(delete_text="Deleting...")
         self.event_manager.add_event(
             event_id="delete_yuzu_data",
+            event_class="disk",
             func=self.delete_data_handler,
             kwargs={"folders": folders},
             completion_functions=[lambda: self.configure_data_buttons(state="normal")],
@@ -1,16 +1,50 @@
+import itertools
 import queue
 import threading
+import time
 import traceback
 
+from core.config import constants
 from core.logging.logger import Logger
 
 
+class CancellationToken:
+    """
+    Passed to the function of a cancellable event so that it can stop early once the event is cancelled.
+    """
+    def __init__(self):
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+
 class ThreadEventManager:
-    def __init__(self, window):
+    DUPLICATE_POLICIES = ("allow", "reject", "coalesce")
+    # The main thread polls for finished events every POLL_INTERVAL_MIN ms while results are arriving
+    # and backs off up to POLL_INTERVAL_MAX ms while events are running without finishing
+    POLL_INTERVAL_MIN = 10
+    POLL_INTERVAL_MAX = 200
+    # The time in seconds to spend processing results before yielding to the Tk event loop
+    POLL_TIME_BUDGET = 0.02
+
+    def __init__(self, window, workers=None, max_queued_events=constants.Events.MAX_QUEUED_EVENTS.value):
         self.logger = Logger(__name__).get_logger()
         self.events = []
         self.window = window
         self.result_queue = queue.Queue()
+        self.workers = workers if workers else constants.Events.WORKERS.value
+        self.max_queued_events = max_queued_events
+        # one queue per event class, each served by its own workers which are started on first use
+        self._event_queues = {}
+        self._event_queues_lock = threading.Lock()
+        # keeps events with the same priority in the order they were added
+        self._event_counter = itertools.count()
+        self._poll_interval = self.POLL_INTERVAL_MIN
+        self._poll_scheduled = False
 
     def is_event_running(self, event_id):
         for event in self.events:
@@ -18,28 +52,185 @@ class ThreadEventManager:
                 return True
         return False
 
-    def add_event(self, event_id, func, kwargs=None, completion_functions=None, error_functions=None, completion_funcs_with_result=None, ignore_messages=False):
+    def _get_event(self, event_id):
+        for event in self.events:
+            if event["id"] == event_id and not event["cancellation_token"].is_cancelled():
+                return event
+        return None
+
+    def cancel_event(self, event_id):
+        """
+        Cancel all queued or running events with the given ID.
+
+        Queued events are skipped and running events are asked to stop through their cancellation token.
+        Only the completion functions of a cancelled event are run, not its error functions,
+        completion functions with result or message.
+
+        Args:
+            event_id (str): The ID of the events to cancel.
+
+        Returns:
+            int: The number of events cancelled.
+        """
+        return self._cancel_matching_events(lambda candidate_id: candidate_id == event_id)
+
+    def cancel_events(self, id_prefix):
+        """
+        Cancel all queued or running events whose ID starts with id_prefix, such as "download_icon_".
+
+        Args:
+            id_prefix (str): The prefix of the IDs of the events to cancel.
+
+        Returns:
+            int: The number of events cancelled.
+        """
+        return self._cancel_matching_events(lambda candidate_id: candidate_id.startswith(id_prefix))
+
+    def _cancel_matching_events(self, matches):
+        cancelled = 0
+        for event in list(self.events):
+            if matches(event["id"]) and not event["cancellation_token"].is_cancelled():
+                event["cancellation_token"].cancel()
+                cancelled += 1
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} events")
+        return cancelled
+
+    def add_event(self, event_id, func, kwargs=None, completion_functions=None, error_functions=None, completion_funcs_with_result=None, ignore_messages=False, event_class="network", on_duplicate="allow", priority=0, cancellable=False):
+        """
+        Queue a function to be run on a worker thread, and its completion functions to be run on the main thread once it finishes.
+
+        Args:
+            event_id (str): The ID of the event.
+            func (callable): The function to run. It should return a dictionary with an optional "result" tuple and "message".
+            kwargs (dict, optional): The keyword arguments to pass to the function.
+            completion_functions (list, optional): Functions to call once the event has finished.
+            error_functions (list, optional): Functions to call if the function raised an exception.
+            completion_funcs_with_result (list, optional): Functions to call with the result of the function.
+            ignore_messages (bool, optional): Whether to skip showing the message returned by the function.
+            event_class (str, optional): The pool of workers to run the event on: "network", "disk", "cpu", "process" or "image".
+            on_duplicate (str, optional): What to do if an event with the same ID is already queued or running.
+                "allow" runs both, "reject" drops the new event and "coalesce" attaches the new
+                completion and error functions to the existing event instead of running it again.
+            priority (int, optional): Queued events with a higher priority are started first.
+            cancellable (bool, optional): Whether to pass the event's CancellationToken to the function
+                as the cancellation_token keyword argument.
+
+        Returns:
+            bool: Whether the event was queued or coalesced. A rejected event is not run, but its
+                completion functions are still called.
+        """
+        if event_class not in self.workers:
+            raise ValueError(f"Unknown event class: {event_class}")
+        if on_duplicate not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy: {on_duplicate}")
+        existing_event = self._get_event(event_id) if on_duplicate != "allow" else None
+        if existing_event is not None and on_duplicate == "coalesce":
+            self.logger.info(f"Event {event_id} is already running, coalescing duplicate")
+            existing_event["completion_functions"].extend(completion_functions or [])
+            existing_event["completion_func_with_result"].extend(completion_funcs_with_result or [])
+            existing_event["error_functions"].extend(error_functions or [])
+            return True
+
+        cancellation_token = CancellationToken()
+        kwargs = dict(kwargs) if kwargs else {}
+        if cancellable:
+            kwargs["cancellation_token"] = cancellation_token
         event = {
             "id": event_id,
             "function": func,
-            "kwargs": kwargs if kwargs else {},
+            "kwargs": kwargs,
             "completion_functions": completion_functions if completion_functions else [],
             "completion_func_with_result": completion_funcs_with_result if completion_funcs_with_result else [],
             "error_functions": error_functions if error_functions else [],
             "ignore_messages": ignore_messages,
-            "output_queue": queue.Queue(),
+            "class": event_class,
+            "priority": priority,
+            "cancellation_token": cancellation_token,
             "error_during_run": False
         }
+        if existing_event is not None:
+            self.logger.info(f"Event {event_id} is already running, rejecting duplicate")
+            self._reject_event(event)
+            return False
+        return self.start_event(event)
+
+    def _reject_event(self, event):
+        """
+        Drop an event without running it. Its completion functions are still run on the main thread,
+        so callers that disabled widgets before adding the event get to restore them.
+        """
+        event["cancellation_token"].cancel()
         self.events.append(event)
-        self.start_event(event)
+        self.result_queue.put((event, {}))
+        self._poll_interval = self.POLL_INTERVAL_MIN
+        if not self._poll_scheduled:
+            self._schedule_poll(self._poll_interval)
+
+    def _get_event_queue(self, event_class):
+        with self._event_queues_lock:
+            event_queue = self._event_queues.get(event_class)
+            if event_queue is None:
+                event_queue = queue.PriorityQueue(maxsize=self.max_queued_events)
+                self._event_queues[event_class] = event_queue
+                for worker_number in range(self.workers[event_class]):
+                    threading.Thread(target=self._worker, args=(event_queue,), name=f"{event_class}-worker-{worker_number}", daemon=True).start()
+            return event_queue
+
+    def _worker(self, event_queue):
+        while True:
+            _, _, event = event_queue.get()
+            if event["cancellation_token"].is_cancelled():
+                self.logger.info(f"Skipping cancelled event: {event["id"]}")
+                self.result_queue.put((event, {}))
+                continue
+            self._run_event(event)
+
+    def _remove_cancelled_events(self, event_queue):
+        """
+        Take cancelled events out of a queue so that they stop counting towards max_queued_events.
+        Their output is passed on as if a worker had skipped them, so their completion functions still run.
+
+        Returns:
+            int: The number of events removed.
+        """
+        live_items = []
+        removed = 0
+        while True:
+            try:
+                item = event_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[2]["cancellation_token"].is_cancelled():
+                self.result_queue.put((item[2], {}))
+                removed += 1
+            else:
+                live_items.append(item)
+        for item in live_items:
+            event_queue.put_nowait(item)
+        return removed
 
     def start_event(self, event):
-        self.logger.info(f"Starting event: {event["id"]}")
-        thread = threading.Thread(target=self._run_event, args=(event,))
-        thread.start()
-        self._main_thread_loop(event)
+        event_queue = self._get_event_queue(event["class"])
+        item = (-event["priority"], next(self._event_counter), event)
+        try:
+            event_queue.put_nowait(item)
+        except queue.Full:
+            # events cancelled while queued stay in the queue until a worker reaches them, so clear them out first
+            if not self._remove_cancelled_events(event_queue):
+                self.logger.warning(f"Too many queued {event["class"]} events, rejecting event: {event["id"]}")
+                self._reject_event(event)
+                return False
+            event_queue.put_nowait(item)
+        self.logger.info(f"Queued event: {event["id"]}")
+        self.events.append(event)
+        self._poll_interval = self.POLL_INTERVAL_MIN
+        if not self._poll_scheduled:
+            self._schedule_poll(self._poll_interval)
+        return True
 
     def _run_event(self, event):
+        self.logger.info(f"Starting event: {event["id"]}")
         try:
             output = event["function"](**event["kwargs"])
         except Exception as e:
@@ -54,17 +245,58 @@ class ThreadEventManager:
         if not output:
             self.logger.warning(f"Event {event["id"]} returned no result")
 
-        event["output_queue"].put(output)
+        self.result_queue.put((event, output))
+
+    def _schedule_poll(self, delay):
+        self._poll_scheduled = True
+        self.window.after(delay, self._poll_results)
+
+    def _poll_results(self):
+        """
+        Process the output of finished events on the main thread.
 
-    def _main_thread_loop(self, event):
-        if not event["output_queue"].empty():
+        This is the only callback scheduled with window.after, no matter how many events are running.
+        It stops rescheduling itself once there are no events left and is restarted by start_event.
+        """
+        self._poll_scheduled = False
+        processed = 0
+        deadline = time.perf_counter() + self.POLL_TIME_BUDGET
+        while time.perf_counter() < deadline:
+            try:
+                event, output = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
             self.logger.info(f"Processing output for event: {event["id"]}")
-            output = event["output_queue"].get()
-            self._process_output(output, event)
+            try:
+                self._process_output(output, event)
+            except Exception as e:
+                self.logger.error(f"Error processing output of event {event["id"]}: {e} \n{traceback.format_exc()}")
+                if event in self.events:
+                    self.events.remove(event)
+            processed += 1
+
+        if not self.result_queue.empty():
+            # ran out of time with results still waiting, let Tk handle other events before continuing
+            self._schedule_poll(1)
+            return
+        if not self.events:
+            self._poll_interval = self.POLL_INTERVAL_MIN
             return
-        self.window.after(50, self._main_thread_loop, event)
+        if processed:
+            self._poll_interval = self.POLL_INTERVAL_MIN
+        else:
+            self._poll_interval = min(self._poll_interval * 2, self.POLL_INTERVAL_MAX)
+        self._schedule_poll(self._poll_interval)
 
     def _process_output(self, output, event):
+        if event["cancellation_token"].is_cancelled():
+            # the requester no longer wants the result, only let it restore its state
+            for completion_func in event["completion_functions"]:
+                completion_func()
+            self.events.remove(event)
+            self.logger.info(f"{event["id"]} event was cancelled and removed from event list")
+            return
+
         # Assuming result is a dictionary with keys "message_func" and "message_args"
         # where both can be None for no message
         message = output.get("message")
@@ -84,8 +316,8 @@ class ThreadEventManager:
 
         # if a completion function with result was provided, run it
         # and pass the result of the event to it
-        # only if there was no error during the event
-        if event["completion_func_with_result"] and not event["error_during_run"]:
+        # only if there was no error during the event and it returned a result
+        if event["completion_func_with_result"] and not event["error_during_run"] and result is not None:
             for completion_func in event["completion_func_with_result"]:
                 completion_func(*result)
 
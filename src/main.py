@@ -2,12 +2,15 @@ import sys
 
 import customtkinter
 
+from core.config import constants
 from core.config.assets import Assets
 from core.config.cache import Cache
 from core.config.paths import Paths
 from core.config.settings import Settings
+from core.config.sqlite_cache import SQLiteCache
 from core.config.versions import Versions
 from core.logging.logger import Logger
+from core.network import web
 from gui.emuhaven import EmuHaven
 
 logger = Logger(__name__).get_logger()
@@ -18,7 +21,14 @@ if __name__ == "__main__":
     paths = Paths()
     settings = Settings(paths)
     versions = Versions(paths)
-    cache = Cache(paths)
+    cache_class = SQLiteCache if settings.cache_backend == "sqlite" else Cache
+    cache = cache_class(paths)
+    cache.start_sweeper()
+    web.set_response_cache(cache)
+    # downloads get their own cache so that they cannot evict icons and the TitleDB
+    artifact_cache = cache_class(paths, max_size=constants.App.ARTIFACT_CACHE_MAX_SIZE.value, cache_directory=paths.artifact_cache_dir)
+    artifact_cache.start_sweeper()
+    web.set_artifact_cache(artifact_cache)
 
     args = sys.argv[1:]
     if args: